@@ -1,13 +1,12 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import base64
+import os
+import tempfile
 from pathlib import Path
 
 from components.gallery_component import create_gallery_html
-from extractor.extractor import PDFExtractor
-from utils.exceptions import PDFProcessingError
-import polars as pl
-import pandas as pd
+from services.job_queue import FAILED, QUEUED, JobQueue
+from utils.exceptions import JobRejectedError
 
 
 st.set_page_config(
@@ -23,30 +22,21 @@ st.write(
 
 st.divider()
 
-def img_to_base64(img_path: str) -> str:
-    try:
-        with open(img_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode("utf-8")
-    except FileNotFoundError:
-        st.warning(f"Imagen no encontrada: {img_path}")
-        return ""
-
 @st.dialog("Patrones soportados por el sistema")
 def mostrar_patrones():
-    tipos = ["Tipo I", "Tipo II", "Tipo III", "Tipo IV", "Tipo V"]
-    imagenes = [
-        "images/tipo_I.png",
-        "images/tipo_II.png",
-        "images/tipo_III.png",
-        "images/tipo_IV.png",
-        "images/tipo_V.png",
-    ]
+    tipos = ("Tipo I", "Tipo II", "Tipo III", "Tipo IV", "Tipo V")
+    imagenes = (
+        "static/images/tipo_I.png",
+        "static/images/tipo_II.png",
+        "static/images/tipo_III.png",
+        "static/images/tipo_IV.png",
+        "static/images/tipo_V.png",
+    )
 
     st.write("A continuación se muestran los **5 tipos de patrones** reconocidos por el sistema:")
     st.info("Solo se procesarán correctamente los PDF cuya primera página coincida con uno de los patrones.")
 
-    html_content = create_gallery_html(tipos, imagenes, img_to_base64)
+    html_content = create_gallery_html(tipos, imagenes)
     components.html(html_content, height=700, scrolling=False)
 
 st.markdown("Antes de procesar un PDF, revisa los patrones compatibles:")
@@ -58,96 +48,228 @@ st.divider()
 
 st.subheader("Cargar archivo PDF para procesar")
 
-uploaded_file = st.file_uploader("Selecciona tu archivo de admisión", type=["pdf"])
 
-if uploaded_file:
-    st.success(f"Archivo cargado correctamente: `{uploaded_file.name}`", icon=':material/check_circle:')
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Cola de trabajos única para todas las sesiones del servidor."""
+    return JobQueue(
+        max_workers=int(os.environ.get("EXTRACTOR_MAX_WORKERS", os.cpu_count() or 1)),
+        max_jobs=int(os.environ.get("EXTRACTOR_MAX_JOBS", "8")),
+        max_pages=int(os.environ.get("EXTRACTOR_MAX_PAGES", "2000")),
+    )
+
+
+job_queue = get_job_queue()
+
+
+def liberar_trabajo(job_id: str):
+    job_queue.release(job_id)
+    st.session_state.pop("job_id", None)
+    for key in [key for key in st.session_state if str(key).startswith(f"zip_{job_id}_")]:
+        Path(st.session_state.pop(key)).unlink(missing_ok=True)
 
-    if st.button("Procesar PDF", icon=':material/play_arrow:'):
+
+def inspeccionar_pdf(uploaded_file):
+    """
+    Lee solo la primera página al subir el archivo. El extractor queda en la
+    sesión para que el procesamiento reutilice el documento abierto.
+    """
+    from services.processing import create_extractor
+    from utils.exceptions import PDFProcessingError
+
+    key = f"probe_{uploaded_file.file_id}"
+    if key not in st.session_state:
+        for old_key in [key for key in st.session_state if str(key).startswith("probe_")]:
+            st.session_state.pop(old_key)[0].close()
+
+        extractor = create_extractor(uploaded_file.getbuffer())
         try:
-            pdf_bytes = uploaded_file.read()
-            
-            progress_bar = st.progress(0, text="Iniciando procesamiento...")
-            status_text = st.empty()
-            
-            def update_progress(current, total, records):
-                percentage = int((current / total) * 100)
-                progress_bar.progress(percentage, text=f"Procesando página {current}/{total}")
-                status_text.info(f"Registros acumulados: **{records}**")
-            
-            with st.spinner("Inicializando extractor..."):
-                extractor = PDFExtractor(pdf_bytes)
-            
-            extractor.process_pdf(progress_callback=update_progress)
-            
-            progress_bar.progress(100, text="Procesamiento completado")
-            
-            year = extractor.year if extractor.year else "desconocido"
-            period = extractor.period if extractor.period else "desconocido"
-            
-            with st.spinner("Generando archivo Excel..."):
-                excel_buffer = extractor.export_to_excel()
-            
-            progress_bar.empty()
-            status_text.empty()
-            
-            st.success(
-                f"Procesamiento completado exitosamente\n\n"
-                f"**Registros extraídos:** {len(extractor.data)}\n\n"
-                f"**Año:** {year} | **Periodo:** {period}",
-                icon=':material/check_circle:'
-            )
-            
-            filename = extractor.get_filename()
-            
+            info = extractor.probe()
+        except PDFProcessingError as e:
+            info = {"valido": False, "error": str(e)}
+        st.session_state[key] = (extractor, info)
+
+    return st.session_state[key]
+
+
+@st.fragment(run_every=1.0)
+def mostrar_progreso(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None or job.is_finished:
+        st.rerun()
+
+    if job.status == QUEUED:
+        st.info("Archivo en cola, se procesará en cuanto haya un worker libre...", icon=':material/schedule:')
+        return
+
+    percentage = int((job.current_page / job.total_pages) * 100) if job.total_pages else 0
+    st.progress(percentage, text=f"Procesando página {job.current_page}/{job.total_pages}")
+    st.info(f"Registros acumulados: **{job.records}**")
+
+
+def generar_zip(job, particion: str) -> Path:
+    """
+    ZIP con un Excel por valor de la partición, escrito en un archivo temporal
+    la primera vez que se pide. La sesión solo guarda su ruta.
+    """
+    from file_handler.file_handler import FileHandler
+
+    key = f"zip_{job.id}_{particion}"
+    if key not in st.session_state or not Path(st.session_state[key]).exists():
+        result = job.result
+        fd, zip_path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        FileHandler.export_partitioned(
+            result["clean"], particion, zip_path, anio=result["year"], periodo=result["period"]
+        )
+        st.session_state[key] = zip_path
+    return Path(st.session_state[key])
+
+
+def mostrar_resultado(job):
+    import pandas as pd
+
+    result = job.result
+    year = result["year"] if result["year"] else "desconocido"
+    period = result["period"] if result["period"] else "desconocido"
+
+    st.success(
+        f"Procesamiento completado exitosamente\n\n"
+        f"**Registros extraídos:** {result['records']}\n\n"
+        f"**Año:** {year} | **Periodo:** {period}",
+        icon=':material/check_circle:'
+    )
+
+    if result.get("cached"):
+        st.caption("Este PDF ya había sido procesado: el resultado se recuperó de la caché.")
+
+    if result["duplicates"]:
+        st.warning(
+            f"{len(result['duplicates'])} DNI(s) aparecen más de una vez en este documento.",
+            icon=':material/warning:'
+        )
+
+    page_errors = result["page_errors"]
+    if page_errors:
+        st.warning(
+            f"{len(page_errors)} página(s) no se pudieron procesar y fueron omitidas.",
+            icon=':material/warning:'
+        )
+        with st.expander("Reporte de páginas con error", expanded=False):
+            st.dataframe(pd.DataFrame(page_errors), use_container_width=True)
+
+    excel_buffer = result["excel"]
+
+    st.download_button(
+        label="Descargar resultado en Excel",
+        data=excel_buffer.getvalue(),
+        file_name=result["filename"],
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        use_container_width=True,
+        on_click=liberar_trabajo,
+        args=(job.id,),
+    )
+
+    particion = st.selectbox(
+        "Descargar un archivo por",
+        ("CARRERA", "FACULTAD", "MODALIDAD"),
+        index=None,
+        placeholder="Elige una columna para dividir el resultado en un ZIP",
+    )
+    if particion and particion in result["clean"].columns:
+        with open(generar_zip(job, particion), "rb") as zip_file:
             st.download_button(
-                label="Descargar resultado en Excel",
-                data=excel_buffer,
-                file_name=filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
+                label=f"Descargar ZIP por {particion.lower()}",
+                data=zip_file,
+                file_name=result["filename"].replace(".xlsx", f"-por-{particion.lower()}.zip"),
+                mime="application/zip",
+                use_container_width=True,
             )
-            
-            with st.expander("Vista previa de los datos extraídos", expanded=False):
-                excel_buffer.seek(0) 
-                df_preview = pd.read_excel(excel_buffer, engine='openpyxl')
-                
-                st.dataframe(df_preview.head(20), use_container_width=True)
+    elif particion:
+        st.info(f"Este PDF no tiene la columna {particion}.", icon=':material/info:')
+
+    with st.expander("Vista previa de los datos extraídos", expanded=False):
+        excel_buffer.seek(0) 
+        df_preview = pd.read_excel(excel_buffer, engine='openpyxl')
         
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.metric("Total registros", len(df_preview))
-                
-                with col2:
-                    ingresos = (df_preview['CONDICION'] == 'INGRESO').sum()
-                    st.metric("Ingresos", ingresos)
-                
-                with col3:
-                    no_ingresos = (df_preview['CONDICION'] == 'NO INGRESO').sum()
-                    st.metric("No Ingresos", no_ingresos)
-                
-                with col4:
-                    ausentes = df_preview['CONDICION'].isin(['AUSENTE', 'ANULADO']).sum()
-                    st.metric("Ausentes/Anulados", ausentes)
+        st.dataframe(df_preview.head(20), use_container_width=True)
+
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total registros", len(df_preview))
+        
+        with col2:
+            ingresos = (df_preview['CONDICION'] == 'INGRESO').sum()
+            st.metric("Ingresos", ingresos)
+        
+        with col3:
+            no_ingresos = (df_preview['CONDICION'] == 'NO INGRESO').sum()
+            st.metric("No Ingresos", no_ingresos)
+        
+        with col4:
+            ausentes = df_preview['CONDICION'].isin(['AUSENTE', 'ANULADO']).sum()
+            st.metric("Ausentes/Anulados", ausentes)
+
+
+uploaded_file = st.file_uploader("Selecciona tu archivo de admisión", type=["pdf"])
+
+if uploaded_file:
+    extractor, probe = inspeccionar_pdf(uploaded_file)
+
+    if "error" in probe:
+        st.error(f"No se pudo leer el PDF: {probe['error']}", icon=':material/error:')
+
+    elif not probe["valido"]:
+        st.error(
+            "La primera página no coincide con ninguno de los patrones soportados. "
+            "Revisa los patrones válidos antes de subir el archivo.",
+            icon=':material/error:',
+        )
+
+    else:
+        st.success(f"Archivo cargado correctamente: `{uploaded_file.name}`", icon=':material/check_circle:')
+        st.caption(
+            f"Formato: {probe['layout'] or '-'} | "
+            f"Año: {probe['anio'] or 'desconocido'} | Periodo: {probe['periodo'] or 'desconocido'} | "
+            f"Modalidad: {probe['modalidad'] or '-'} | Carrera: {probe['carrera'] or '-'} | "
+            f"{probe['paginas']} páginas, ~{probe['segundos_estimados']} s estimados"
+        )
+
+    if probe.get("valido") and st.button("Procesar PDF", icon=':material/play_arrow:'):
+        try:
+            job = job_queue.submit(
+                uploaded_file.getbuffer(),
+                uploaded_file.name,
+                extractor=extractor,
+                total_pages=probe["paginas"],
+            )
+            st.session_state["job_id"] = job.id
+            # El extractor (y su documento abierto) pasa al trabajo
+            del st.session_state[f"probe_{uploaded_file.file_id}"]
+
+        except JobRejectedError as e:
+            st.error(f"{e}", icon=':material/error:')
 
-        except PDFProcessingError as e:
-            if 'progress_bar' in locals():
-                progress_bar.empty()
-            if 'status_text' in locals():
-                status_text.empty()
-            st.error(f"Error de procesamiento: {e}", icon=':material/error:')
-            
         except Exception as e:
-            if 'progress_bar' in locals():
-                progress_bar.empty()
-            if 'status_text' in locals():
-                status_text.empty()
             st.error(f"{e}", icon=':material/error:')
 
 else:
     st.info("Sube un archivo PDF para comenzar el análisis.", icon=':material/upload:')
 
+job_id = st.session_state.get("job_id")
+job = job_queue.get(job_id) if job_id else None
+
+if job is not None and not job.is_finished:
+    mostrar_progreso(job.id)
+
+elif job is not None and job.status == FAILED:
+    st.error(f"Error de procesamiento: {job.error}", icon=':material/error:')
+    liberar_trabajo(job.id)
+
+elif job is not None:
+    mostrar_resultado(job)
+
 st.divider()
 
 st.write('Desarrollado por Anderson Talla')
\ No newline at end of file
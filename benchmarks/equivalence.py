@@ -0,0 +1,246 @@
+"""
+Benchmark y comparación diferencial entre la ruta de referencia y rutas candidatas.
+
+Uso:
+    python -m benchmarks.equivalence corpus/ archivo.pdf paginas.txt [--candidates palabras rangos]
+        [--pdf-candidate modulo:funcion] [--text-candidate modulo:funcion] [--repeat 3]
+
+Para cada PDF se compara el DataFrame limpio de la referencia (`PDFExtractor`
++ `FileHandler.build_clean_dataframe`) con el de cada candidata. Los archivos
+.txt son textos de página: se compara, línea por línea, el registro de
+`process_line` + `TextCleaner` con el de la candidata. Se reportan la mediana
+de tiempo de ambas rutas, la aceleración, el porcentaje de filas iguales en
+la misma posición y las diferencias por fila y celda. Termina con código 1 si
+alguna candidata no coincide.
+
+Una candidata externa es una función `modulo:funcion` que recibe la ruta del
+PDF y retorna un DataFrame de Polars, o recibe la lista de líneas y retorna
+un registro (o None) por línea.
+"""
+import argparse
+import importlib
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from extractor.extractor import PDFExtractor
+from file_handler.file_handler import FileHandler
+
+
+def _extract_clean(pdf_path: str, **options) -> pl.DataFrame:
+    extractor = PDFExtractor(pdf_path, **options)
+    extractor.process_pdf()
+    return FileHandler.build_clean_dataframe(extractor.data)
+
+
+def _sharded_clean(pdf_path: str, pages_per_unit: int = 5) -> pl.DataFrame:
+    from extractor.sharding import merge_partials, plan_units, run_unit
+
+    with tempfile.TemporaryDirectory() as directory:
+        for manifest in plan_units(pdf_path, directory, pages_per_unit):
+            run_unit(manifest)
+        return FileHandler.build_clean_dataframe(merge_partials(directory)["data"])
+
+
+def _pipelined_clean(pdf_path: str) -> pl.DataFrame:
+    from services.pipeline import run_pipelined
+
+    df_clean, _ = run_pipelined(PDFExtractor(pdf_path))
+    return df_clean
+
+
+def _reference_lines(lines: List[str]) -> List[Optional[Dict[str, str]]]:
+    extractor = PDFExtractor(b"")
+    return [extractor.process_line(line) for line in lines]
+
+
+PDF_PIPELINES: Dict[str, Callable[[str], pl.DataFrame]] = {
+    "referencia": _extract_clean,
+    "cabecera": lambda pdf_path: _extract_clean(pdf_path, memoize_header=True),
+    "palabras": lambda pdf_path: _extract_clean(pdf_path, parser="words"),
+    "memoria": lambda pdf_path: _extract_clean(pdf_path, memory_budget_mb=0.5),
+    "rangos": _sharded_clean,
+    "etapas": _pipelined_clean,
+}
+
+TEXT_PIPELINES: Dict[str, Callable[[List[str]], List[Optional[Dict[str, str]]]]] = {
+    "referencia": _reference_lines,
+}
+
+
+def load_callable(spec: str) -> Callable:
+    """Importa una función dada como `modulo:funcion`."""
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Se esperaba modulo:funcion, se recibió {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def timed(function: Callable, argument: Any, repeat: int) -> Tuple[float, Any]:
+    """Mediana de `repeat` ejecuciones y el resultado de la última."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(argument)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def diff_frames(reference: pl.DataFrame, candidate: pl.DataFrame, limit: int = 20) -> List[str]:
+    """Diferencias de esquema y de celdas, fila por fila en el mismo orden."""
+    differences = []
+    if reference.schema != candidate.schema:
+        differences.append(f"esquema: {dict(reference.schema)} != {dict(candidate.schema)}")
+    if reference.height != candidate.height:
+        differences.append(f"filas: {reference.height} != {candidate.height}")
+
+    columns = [column for column in reference.columns if column in candidate.columns]
+    ref_rows = reference.select(columns).iter_rows()
+    cand_rows = candidate.select(columns).iter_rows()
+    for index, (ref_row, cand_row) in enumerate(zip(ref_rows, cand_rows)):
+        for column, ref_value, cand_value in zip(columns, ref_row, cand_row):
+            if ref_value != cand_value:
+                differences.append(f"fila {index}, {column}: {ref_value!r} != {cand_value!r}")
+                if len(differences) >= limit:
+                    return differences
+
+    for index in range(min(reference.height, candidate.height), max(reference.height, candidate.height)):
+        side = "referencia" if index < reference.height else "candidata"
+        differences.append(f"fila {index} solo en {side}")
+        if len(differences) >= limit:
+            break
+
+    return differences
+
+
+def agreement(reference: List[Any], candidate: List[Any]) -> float:
+    """Porcentaje de filas iguales en la misma posición."""
+    total = max(len(reference), len(candidate))
+    same = sum(1 for ref_row, cand_row in zip(reference, candidate) if ref_row == cand_row)
+    return round(100 * same / total, 2) if total else 100.0
+
+
+def diff_lines(
+    lines: List[str],
+    reference: List[Optional[Dict[str, str]]],
+    candidate: List[Optional[Dict[str, str]]],
+    limit: int = 20,
+) -> List[str]:
+    """Líneas cuyo registro difiere entre la referencia y la candidata."""
+    differences = []
+    for number, (line, ref_record, cand_record) in enumerate(zip(lines, reference, candidate), start=1):
+        if ref_record != cand_record:
+            differences.append(f"línea {number} {line.strip()!r}: {ref_record} != {cand_record}")
+            if len(differences) >= limit:
+                break
+    if len(reference) != len(candidate) and len(differences) < limit:
+        differences.append(f"resultados: {len(reference)} != {len(candidate)}")
+    return differences
+
+
+def compare(
+    path: Path,
+    candidates: Dict[str, Callable],
+    repeat: int = 3,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """Compara cada candidata con la referencia sobre un PDF o un texto de página."""
+    is_text = path.suffix.lower() == ".txt"
+    if is_text:
+        argument: Any = path.read_text(encoding="utf-8").split("\n")
+        reference_fn = TEXT_PIPELINES["referencia"]
+    else:
+        argument = str(path)
+        reference_fn = PDF_PIPELINES["referencia"]
+
+    reference_time, reference = timed(reference_fn, argument, repeat)
+    results = []
+
+    for name, candidate_fn in candidates.items():
+        elapsed, candidate = timed(candidate_fn, argument, repeat)
+        if is_text:
+            differences = diff_lines(argument, reference, candidate, limit)
+            rows = sum(1 for record in candidate if record)
+            concordance = agreement(reference, candidate)
+        else:
+            differences = diff_frames(reference, candidate, limit)
+            rows = candidate.height
+            columns = [column for column in reference.columns if column in candidate.columns]
+            concordance = agreement(
+                reference.select(columns).rows(), candidate.select(columns).rows()
+            )
+
+        results.append({
+            "archivo": str(path),
+            "candidata": name,
+            "referencia_s": round(reference_time, 3),
+            "candidata_s": round(elapsed, 3),
+            "aceleracion": round(reference_time / elapsed, 2) if elapsed else 0.0,
+            "filas": rows,
+            "concordancia": concordance,
+            "coincide": not differences,
+            "diferencias": differences,
+        })
+
+    return results
+
+
+def expand_corpus(paths: List[Path]) -> List[Path]:
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in (".pdf", ".txt")))
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("corpus", nargs="+", type=Path)
+    parser.add_argument(
+        "--candidates", nargs="+", default=[name for name in PDF_PIPELINES if name != "referencia"],
+        choices=[name for name in PDF_PIPELINES if name != "referencia"],
+    )
+    parser.add_argument("--pdf-candidate", action="append", default=[], help="modulo:funcion")
+    parser.add_argument("--text-candidate", action="append", default=[], help="modulo:funcion")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-diffs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    pdf_candidates = {name: PDF_PIPELINES[name] for name in args.candidates}
+    pdf_candidates.update({spec: load_callable(spec) for spec in args.pdf_candidate})
+    text_candidates = {spec: load_callable(spec) for spec in args.text_candidate}
+
+    all_match = True
+    for path in expand_corpus(args.corpus):
+        candidates = text_candidates if path.suffix.lower() == ".txt" else pdf_candidates
+        if not candidates:
+            continue
+
+        print(path)
+        print(
+            f"{'candidata':<24} {'referencia_s':>12} {'candidata_s':>12} "
+            f"{'aceleracion':>12} {'filas':>7} {'concordancia':>13} {'coincide':>9}"
+        )
+        for row in compare(path, candidates, args.repeat, args.max_diffs):
+            print(
+                f"{row['candidata']:<24} {row['referencia_s']:>12} {row['candidata_s']:>12} "
+                f"{row['aceleracion']:>12} {row['filas']:>7} {row['concordancia']:>13} "
+                f"{str(row['coincide']):>9}"
+            )
+            for difference in row["diferencias"]:
+                print(f"    {difference}")
+            all_match = all_match and row["coincide"]
+
+    return 0 if all_match else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Presupuesto de tiempo de importación medido con `python -X importtime`.
+
+Uso:
+    python -m benchmarks.import_budget [--runs 3] [--scale 1.0]
+
+Importa cada módulo en un proceso nuevo y termina con código 1 si alguno
+supera su presupuesto o carga una dependencia pesada que no le corresponde.
+`--scale` multiplica los presupuestos para máquinas más lentas.
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+HEAVY_MODULES = ("pandas", "polars", "pdfplumber", "pdfminer", "openpyxl", "streamlit")
+
+# módulo: (presupuesto en ms, dependencias pesadas permitidas)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "utils": (15, ()),
+    "utils.patterns": (15, ()),
+    "utils.text_cleaner": (15, ()),
+    "extractor": (15, ()),
+    "file_handler": (15, ()),
+    "services": (15, ()),
+    "services.job_queue": (80, ()),
+    "extractor.extractor": (300, ("pdfplumber", "pdfminer")),
+    "file_handler.file_handler": (1200, ("pandas", "polars")),
+}
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Líneas de -X importtime como (módulo, profundidad, acumulado en µs)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(cumulative)))
+    return entries
+
+
+def _run(code: str) -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return _parse_importtime(result.stderr)
+
+
+def measure(module: str, baseline: Set[str]) -> Tuple[float, Set[str]]:
+    """Tiempo (ms) de importar el módulo y paquetes de primer nivel que carga."""
+    entries = [entry for entry in _run(f"import {module}") if entry[0] not in baseline]
+    total_us = sum(cumulative for _, depth, cumulative in entries if depth == 0)
+    packages = {name.split(".")[0] for name, _, _ in entries}
+    return total_us / 1000, packages
+
+
+def check(runs: int = 3, scale: float = 1.0) -> bool:
+    baseline = {name for name, _, _ in _run("pass")}
+    ok = True
+
+    print(f"{'módulo':<28} {'ms':>9} {'límite':>9}  estado")
+    for module, (budget, allowed) in BUDGETS.items():
+        samples = [measure(module, baseline) for _ in range(runs)]
+        elapsed = min(ms for ms, _ in samples)
+        loaded = set().union(*(packages for _, packages in samples))
+        forbidden = sorted(
+            name for name in loaded if name in HEAVY_MODULES and name not in allowed
+        )
+
+        status = "ok"
+        if elapsed > budget * scale:
+            status = "EXCEDE PRESUPUESTO"
+        if forbidden:
+            status = f"CARGA {', '.join(forbidden)}"
+        ok = ok and status == "ok"
+
+        print(f"{module:<28} {elapsed:>9.1f} {budget * scale:>9.1f}  {status}")
+
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if not check(args.runs, args.scale):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,48 @@
+import base64
+import io
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
 
-def create_gallery_html(tipos, imagenes, img_to_base64_func):    
+# Ancho de las miniaturas (el doble del ancho mostrado, para pantallas de alta densidad)
+THUMBNAIL_WIDTH = 300
+
+
+@lru_cache(maxsize=None)
+def build_thumbnail(img_path: str, width: int = THUMBNAIL_WIDTH) -> str:
+    """
+    Miniatura JPEG en base64 de una imagen. Se genera una sola vez por proceso.
+    """
+    from PIL import Image
+
+    with Image.open(img_path) as image:
+        image.thumbnail((width, width * 10))
+        image = image.convert("RGBA")
+        thumbnail = Image.new("RGB", image.size, "white")
+        thumbnail.paste(image, mask=image.getchannel("A"))
+
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, "JPEG", quality=80)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def static_url(img_path: str) -> str:
+    """URL servida por Streamlit (enableStaticServing) para un archivo de ./static."""
+    return f"app/{Path(img_path).as_posix()}"
+
+
+def create_gallery_html(tipos: Tuple[str, ...], imagenes: Tuple[str, ...]) -> str:
+    """
+    HTML de la galería. Solo las miniaturas van embebidas; la imagen completa
+    se descarga al abrir el modal. El resultado se cachea por proceso según
+    qué imágenes existen, así una imagen que falta se muestra al agregarla.
+    """
+    disponibles = tuple(Path(img).exists() for img in imagenes)
+    return _gallery_html(tipos, imagenes, disponibles)
+
+
+@lru_cache(maxsize=None)
+def _gallery_html(tipos: Tuple[str, ...], imagenes: Tuple[str, ...], disponibles: Tuple[bool, ...]) -> str:
     html_content = """
     <style>
     .gallery {
@@ -128,12 +170,12 @@ def create_gallery_html(tipos, imagenes, img_to_base64_func):
     """
 
     # Agregar las imágenes a la galería
-    for tipo, img in zip(tipos, imagenes):
-        if Path(img).exists():
-            b64 = img_to_base64_func(img)
+    for tipo, img, disponible in zip(tipos, imagenes, disponibles):
+        if disponible:
+            thumbnail = build_thumbnail(img)
             html_content += f"""
             <div>
-                <img src="data:image/png;base64,{b64}" alt="{tipo}" onclick="openModal('data:image/png;base64,{b64}', '{tipo}')">
+                <img src="data:image/jpeg;base64,{thumbnail}" alt="{tipo}" onclick="openModal('{static_url(img)}', this.src, '{tipo}')">
                 <p style='text-align:center; font-weight:bold;'>{tipo}</p>
             </div>
             """
@@ -167,10 +209,15 @@ def create_gallery_html(tipos, imagenes, img_to_base64_func):
     var isDragging = false;
     var startX = 0, startY = 0, translateX = 0, translateY = 0;
 
-    function openModal(src, caption) {
+    function openModal(src, fallbackSrc, caption) {
         var modal = document.getElementById("imgModal");
         var img = document.getElementById("modalImage");
         modal.style.display = "block";
+        // Si la imagen completa no está disponible se muestra la miniatura
+        img.onerror = function() {
+            img.onerror = null;
+            img.src = fallbackSrc;
+        };
         img.src = src;
         document.getElementById("caption").innerHTML = caption;
         resetZoom();
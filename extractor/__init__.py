@@ -1,2 +1,26 @@
-from .extractor import *
-from .metadata_parser import *
+"""
+Motor de extracción. Las clases se importan a demanda para que importar el
+paquete (o uno de sus módulos livianos) no cargue pdfplumber ni los
+módulos de exportación.
+"""
+import importlib
+
+_EXPORTS = {
+    "PDFExtractor": ".extractor",
+    "DocumentContext": ".core",
+    "MetadataParser": ".metadata_parser",
+    "CheckpointStore": ".checkpoint",
+    "PageWorker": ".page_worker",
+    "WordRowParser": ".word_parser",
+    "BufferReader": ".pdf_source",
+    "SharedPDFBuffer": ".pdf_source",
+    "SpilledRecords": ".spill",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
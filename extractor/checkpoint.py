@@ -0,0 +1,79 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class CheckpointStore:
+    """
+    Archivo de avance (JSON Lines) de un PDF identificado por su hash.
+    Cada línea guarda los registros de una página terminada junto con el
+    estado de metadata, el contador `order` y las columnas del parser por
+    coordenadas al cerrar esa página, y los errores registrados en ella.
+    """
+
+    def __init__(self, directory: Union[str, Path], pdf_hash: str) -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / f"{pdf_hash}.jsonl"
+
+    def load(
+        self,
+    ) -> Tuple[int, List[Dict[str, Any]], Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Lee el avance guardado.
+
+        Returns:
+            (última página terminada, registros acumulados, estado al cerrar esa página,
+            errores de página acumulados). Si no hay avance retorna (0, [], {}, []).
+        """
+        if not self.path.exists():
+            return 0, [], {}, []
+
+        last_page = 0
+        records: List[Dict[str, Any]] = []
+        state: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        valid_bytes = 0
+
+        with open(self.path, "rb") as f:
+            for raw_line in f:
+                # Una línea incompleta indica una escritura interrumpida
+                if not raw_line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    break
+
+                last_page = entry["page"]
+                records.extend(entry["records"])
+                state = entry["state"]
+                errors.extend(entry.get("errors", []))
+                valid_bytes += len(raw_line)
+
+        # Descartar restos de una escritura interrumpida antes de seguir agregando
+        if valid_bytes != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+        return last_page, records, state, errors
+
+    def save_page(
+        self,
+        page_number: int,
+        records: List[Dict[str, Any]],
+        state: Dict[str, Any],
+        errors: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Agrega de forma durable el resultado de una página terminada."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {"page": page_number, "records": records, "state": state, "errors": errors or []}
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """Elimina el avance una vez terminado el documento."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,295 @@
+"""
+Núcleo de extracción sin estado global: funciones puras que reciben un
+`DocumentContext` con todo el estado de un documento (metadata vigente,
+contador de orden, registros y columnas del parser por coordenadas). Cada documento usa su propio contexto, así que varios
+documentos se pueden procesar a la vez en hilos distintos.
+
+    ctx = DocumentContext(parser="words")
+    with pdfplumber.open(ruta) as pdf:
+        for numero in range(1, len(pdf.pages) + 1):
+            ctx.data.extend(run_page_isolated(ctx, pdf, numero))
+
+`PDFExtractor` es un envoltorio compatible sobre estas funciones.
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from extractor.metadata_parser import MetadataParser
+from extractor.spill import SpilledRecords
+from extractor.word_parser import WordRowParser
+from utils.exceptions import PatternMatchError
+from utils.patterns import PatternManager
+from utils.text_cleaner import TextCleaner
+
+PARSERS = ("text", "words")
+
+# Inicio de las líneas que pueden aportar modalidad, carrera o escuela
+METADATA_PREFIXES = ("MODALIDAD", "CARRERA", "ESCUELA")
+
+# Campos de metadata y contador que determinan cómo continúa el documento
+STATE_FIELDS = ("modality", "career", "school", "year", "period", "order")
+
+
+class DocumentContext:
+    """
+    Estado de extracción de un documento. No se comparte entre documentos ni
+    entre hilos.
+    """
+
+    def __init__(
+        self,
+        parser: str = "text",
+        memory_budget_mb: Optional[float] = None,
+        memoize_header: bool = False,
+    ) -> None:
+        if parser not in PARSERS:
+            raise ValueError(f"Parser no soportado: {parser}")
+
+        self.parser = parser
+        self.memoize_header = memoize_header
+
+        self.modality = ""
+        self.career = ""
+        self.school = ""
+        self.year = ""
+        self.period = ""
+        self.order = 1
+
+        self.data: Union[List[Dict[str, str]], SpilledRecords] = []
+        if memory_budget_mb is not None:
+            self.data = SpilledRecords(int(memory_budget_mb * 1024 * 1024))
+        self.page_errors: List[Dict[str, Any]] = []
+
+        self.word_parser = WordRowParser()
+        self.header_fingerprint: Optional[str] = None
+        self.header_metadata: Optional[Dict[str, str]] = None
+
+    def get_options(self) -> Dict[str, Any]:
+        """Opciones de extracción, para recrear el contexto en otro proceso."""
+        return {
+            "parser": self.parser,
+            "memoize_header": self.memoize_header,
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Estado de metadata, contador y columnas del parser por coordenadas
+        necesario para continuar el documento.
+        """
+        state = {field: getattr(self, field) for field in STATE_FIELDS}
+        state["columns"] = self.word_parser.columns
+        return state
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        for field, value in state.items():
+            if field == "columns":
+                self.word_parser.columns = value
+            else:
+                setattr(self, field, value)
+
+
+def process_line(line: str) -> Optional[Dict[str, str]]:
+    """
+    Procesa una línea de resultados usando patrones priorizados.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    for pattern_name, pattern, extractor in PatternManager.get_extraction_patterns():
+        if match := pattern.match(line):
+            try:
+                dni, name, score, condition = extractor(match)
+
+                return {
+                    "dni": str(dni),
+                    "apellidos_nombres": TextCleaner.clean_name(name),
+                    "puntaje": TextCleaner.parse_score(score),
+                    "condicion": TextCleaner.clean_condition(condition),
+                }
+            except Exception as e:
+                raise PatternMatchError(f"Error processing pattern {pattern_name}: {e}")
+
+    return None
+
+
+def header_lines(lines: List[str]) -> List[str]:
+    """Líneas antes de la primera fila de datos (todas las filas inician con un número)."""
+    header = []
+    for line in lines:
+        if line.lstrip()[:1].isdigit():
+            break
+        header.append(line)
+    return header
+
+
+def parse_metadata(text_upper: str, lines: List[str]) -> Dict[str, str]:
+    """Año, periodo, modalidad, carrera y escuela leídos de un texto en mayúsculas."""
+    year, period = PatternManager.extract_year_period(text_upper)
+    found = {"modality": "", "career": "", "school": ""}
+
+    # Extractores de metadata por línea
+    extractors = [
+        (
+            lambda: not found["modality"],
+            MetadataParser.extract_modality,
+            "modality",
+        ),
+        (
+            lambda: not found["career"],
+            MetadataParser.extract_career,
+            "career",
+        ),
+        (
+            lambda: not found["school"] and not found["career"],
+            MetadataParser.extract_school,
+            "school",
+        ),
+    ]
+
+    for line in lines:
+        for condition, extractor_func, attr_name in extractors:
+            if condition():
+                result = extractor_func(line)
+                if result:
+                    found[attr_name] = result
+
+    # Si solo hay escuela pero no carrera, usar escuela como carrera
+    if found["school"] and not found["career"]:
+        found["career"] = found["school"]
+        found["school"] = ""
+
+    return {"year": year, "period": period, **found}
+
+
+def extract_metadata(ctx: DocumentContext, text: str) -> None:
+    """
+    Extrae toda la metadata de la página actual. Con `memoize_header`, si
+    el encabezado (líneas antes de la primera fila de datos) es igual al
+    de la página anterior y el resto de la página no tiene líneas de
+    modalidad, carrera o escuela, se reutilizan esos campos; año y periodo
+    se leen siempre de la página completa.
+    """
+    text_upper = text.upper()
+    lines = text_upper.split("\n")
+
+    if not ctx.memoize_header:
+        ctx.set_state(parse_metadata(text_upper, lines))
+        return
+
+    header = header_lines(lines)
+    fingerprint = "\n".join(header)
+    # Los extractores de metadata solo reconocen líneas que inician con estas palabras
+    body_has_metadata = any(line.startswith(METADATA_PREFIXES) for line in lines[len(header):])
+
+    if fingerprint and fingerprint == ctx.header_fingerprint and not body_has_metadata:
+        year, period = PatternManager.extract_year_period(text_upper)
+        ctx.set_state({**ctx.header_metadata, "year": year, "period": period})
+        return
+
+    metadata = parse_metadata(text_upper, lines)
+    ctx.set_state(metadata)
+
+    # Sin metadata fuera del encabezado, modalidad, carrera y escuela salen solo de él
+    if fingerprint and not body_has_metadata:
+        ctx.header_fingerprint, ctx.header_metadata = fingerprint, metadata
+    else:
+        ctx.header_fingerprint, ctx.header_metadata = None, None
+
+
+def add_metadata(ctx: DocumentContext, record: Dict[str, str]) -> Dict[str, str]:
+    """
+    Agrega metadata persistente a un registro.
+    """
+    metadata_fields = {
+        "modalidad_ingreso": ctx.modality,
+        "carrera": ctx.career,  #Usar la carrera obligatorio
+        "anio": str(ctx.year),
+        "periodo": str(ctx.period),
+        "orden_original": ctx.order,
+    }
+
+    return {**record, **metadata_fields}
+
+
+def parse_text(ctx: DocumentContext, page) -> Tuple[str, List[Dict[str, str]]]:
+    """Ruta de texto: `extract_text` y patrones por línea."""
+    text = page.extract_text()
+    line_results = [
+        line_result for line in (text or "").split("\n")
+        if (line_result := process_line(line))
+    ]
+    return text, line_results
+
+
+def parse_words(ctx: DocumentContext, page) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Ruta por coordenadas: columnas por posición de las palabras. Mientras
+    no se haya visto el encabezado de la tabla se usa la ruta de texto.
+    """
+    parsed = ctx.word_parser.parse_page(page)
+    if parsed is None:
+        return parse_text(ctx, page)
+    return parsed["text"], parsed["records"]
+
+
+def process_page(ctx: DocumentContext, page) -> List[Dict[str, str]]:
+    """
+    Procesa una página completa.
+    """
+    if ctx.parser == "words":
+        text, line_results = parse_words(ctx, page)
+    else:
+        text, line_results = parse_text(ctx, page)
+
+    if not text:
+        return []
+
+    extract_metadata(ctx, text)
+    records = []
+
+    for line_result in line_results:
+        complete_record = add_metadata(ctx, line_result)
+        records.append(complete_record)
+        ctx.order += 1
+
+    return records
+
+
+def learn_columns_before(ctx: DocumentContext, pdf, first_page: int) -> None:
+    """
+    Recupera las columnas del parser por coordenadas que tendría una
+    ejecución completa al llegar a `first_page`: las del último encabezado
+    de tabla en las páginas anteriores.
+    """
+    for page_number in range(first_page - 1, 0, -1):
+        for row in ctx.word_parser.group_rows(pdf.pages[page_number - 1].extract_words()):
+            ctx.word_parser.learn_columns(row)
+        if ctx.word_parser.columns is not None:
+            return
+
+
+def run_page_isolated(ctx: DocumentContext, pdf, page_number: int, worker=None) -> List[Dict[str, str]]:
+    """
+    Procesa una página sin abortar el documento. Si falla o excede el tiempo
+    límite (con un `PageWorker`), restaura el estado previo y registra el
+    error en `ctx.page_errors`.
+    """
+    state_before = ctx.get_state()
+    started = time.perf_counter()
+
+    try:
+        if worker:
+            records, state = worker.run_page(page_number, state_before)
+            ctx.set_state(state)
+            return records
+        return process_page(ctx, pdf.pages[page_number - 1])
+
+    except Exception as e:
+        ctx.set_state(state_before)
+        ctx.page_errors.append({
+            "pagina": page_number,
+            "error": f"{type(e).__name__}: {e}",
+            "segundos": round(time.perf_counter() - started, 3),
+        })
+        return []
@@ -1,182 +1,341 @@
 import pdfplumber
+import hashlib
 import io
-from typing import List, Dict, Optional, Callable, Union
+import mmap
+import time
+from collections import Counter
+from typing import Any, List, Dict, Optional, Callable, Tuple, Union
 from pathlib import Path
 
-from utils.text_cleaner import TextCleaner
-from extractor.metadata_parser import MetadataParser
-from file_handler.file_handler import FileHandler
-from utils.exceptions import PDFProcessingError, PatternMatchError
+from extractor import core
+from extractor.checkpoint import CheckpointStore
+from extractor.core import DocumentContext
+from extractor.page_worker import PageWorker
+from extractor.pdf_source import BufferReader, SharedPDFBuffer, open_mapped, source_view
+from utils.exceptions import PDFProcessingError
 from utils.patterns import PatternManager
 
 
+def _context_attribute(name: str) -> property:
+    return property(
+        lambda self: getattr(self.context, name),
+        lambda self, value: setattr(self.context, name, value),
+    )
+
+
 class PDFExtractor:
-    def __init__(self, pdf_source: Union[bytes, io.BytesIO, str, Path]) -> None:
-        self.pdf_source = self._prepare_pdf_source(pdf_source)
-        self.data: List[Dict[str, str]] = []
-        self._reset_metadata()
-        self.order = 1
-
-    def _prepare_pdf_source(self, source: Union[bytes, io.BytesIO, str, Path]) -> io.BytesIO:
-        if isinstance(source, bytes):
-            return io.BytesIO(source)
+    """
+    Envoltorio de un documento sobre `extractor.core`: prepara la fuente,
+    orquesta páginas, avance y workers, y guarda el estado del documento en
+    `self.context` (un `DocumentContext`).
+    """
+
+    # Opciones y estado del documento, expuestos como atributos del extractor
+    parser = _context_attribute("parser")
+    memoize_header = _context_attribute("memoize_header")
+    modality = _context_attribute("modality")
+    career = _context_attribute("career")
+    school = _context_attribute("school")
+    year = _context_attribute("year")
+    period = _context_attribute("period")
+    order = _context_attribute("order")
+    data = _context_attribute("data")
+    page_errors = _context_attribute("page_errors")
+
+    def __init__(
+        self,
+        pdf_source: Union[bytes, bytearray, memoryview, io.BytesIO, str, Path],
+        parser: str = "text",
+        memory_budget_mb: Optional[float] = None,
+        memoize_header: bool = False,
+    ) -> None:
+        """
+        Args:
+            pdf_source: PDF como bytes, buffer (memoryview, BytesIO) o ruta.
+            parser: "text" (patrones sobre `extract_text`) o "words" (columnas por
+                    coordenadas de `extract_words`).
+            memory_budget_mb: Memoria máxima para los registros acumulados. Al
+                              superarla se escriben en fragmentos Parquet temporales
+                              y `data` pasa a ser un `SpilledRecords`.
+            memoize_header: Reutilizar modalidad, carrera y escuela de la página
+                            anterior cuando el encabezado se repite y no hay
+                            líneas de metadata fuera de él.
+        """
+        self.context = DocumentContext(parser, memory_budget_mb, memoize_header)
+        self.pdf_path: Optional[Path] = None
+        self._source = self._prepare_pdf_source(pdf_source)
+        self._pdf_hash: Optional[str] = None
+        # Documento abierto por probe(), reutilizado por process_pdf
+        self._pdf = None
+
+    def _prepare_pdf_source(
+        self, source: Union[bytes, bytearray, memoryview, io.BytesIO, str, Path]
+    ) -> Union[io.BytesIO, BufferReader, mmap.mmap]:
+        """
+        Prepara la fuente sin duplicar el PDF en memoria: las rutas se mapean
+        con mmap y los buffers (bytes, memoryview de una carga) se leen en sitio.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # No BytesIO: getbuffer() (hash, memoria compartida) copiaría los bytes
+            return BufferReader(source)
         elif isinstance(source, io.BytesIO):
             return source
         elif isinstance(source, (str, Path)):
-            with open(source, 'rb') as f:
-                return io.BytesIO(f.read())
+            self.pdf_path = Path(source)
+            return open_mapped(source)
         else:
             raise ValueError(f"Tipo de fuente no soportado: {type(source)}")
 
-    def _reset_metadata(self) -> None:
-        self.modality = ""
-        self.career = ""
-        self.school = ""
-        self.year = ""
-        self.period = ""
+    @property
+    def pdf_source(self) -> Union[io.BytesIO, BufferReader, mmap.mmap]:
+        """Fuente del PDF. Un archivo cuyo mapeo ya se liberó se vuelve a mapear."""
+        if self._source is None:
+            self._source = open_mapped(self.pdf_path)
+        return self._source
 
-    def extract_metadata(self, text: str) -> None:
+    def _release_mapping(self) -> None:
+        """Libera el mapeo de un PDF leído de una ruta."""
+        if self.pdf_path is not None and self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def get_options(self) -> Dict[str, Any]:
+        """Opciones de extracción, para recrear el extractor en otro proceso."""
+        return self.context.get_options()
+
+    def get_pdf_hash(self) -> str:
+        """SHA-256 del contenido del PDF."""
+        if self._pdf_hash is None:
+            with source_view(self.pdf_source) as view:
+                self._pdf_hash = hashlib.sha256(view).hexdigest()
+        return self._pdf_hash
+
+    def _open_pdf(self):
+        """Documento abierto por `probe()` si lo hay; si no, uno nuevo."""
+        pdf, self._pdf = self._pdf, None
+        return pdf if pdf is not None else pdfplumber.open(self.pdf_source)
+
+    def close(self) -> None:
         """
-        Extrae toda la metadata de la página actual.
+        Cierra el documento abierto por `probe()` si no se llegó a procesar y
+        libera el mapeo del archivo.
         """
-        text_upper = text.upper()
-        lines = text_upper.split("\n")
-
-        # Extraer Año y Periodo
-        self.year, self.period = PatternManager.extract_year_period(text_upper)
-
-        # Reset metadata de página
-        self.career = ""
-        self.school = ""
-        self.modality = ""
-
-        # Extractores de metadata por línea
-        extractors = [
-            (
-                lambda line: not self.modality,
-                MetadataParser.extract_modality,
-                "modality",
-            ),
-            (
-                lambda line: not self.career,
-                MetadataParser.extract_career,
-                "career",
-            ),
-            (
-                lambda line: not self.school and not self.career,
-                MetadataParser.extract_school,
-                "school",
-            ),
-        ]
-
-        for line in lines:
-            for condition, extractor_func, attr_name in extractors:
-                if condition(line):
-                    result = extractor_func(line)
-                    if result:
-                        setattr(self, attr_name, result)
-        
-        # Si solo hay escuela pero no carrera, usar escuela como carrera
-        if self.school and not self.career:
-            self.career = self.school
-            self.school = ""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        self._release_mapping()
 
-    def process_line(self, line: str) -> Optional[Dict[str, str]]:
+    def probe(self) -> Dict[str, Any]:
         """
-        Procesa una línea de resultados usando patrones priorizados.
+        Lee solo la primera página para validar el PDF antes de procesarlo. No
+        modifica el estado de extracción y deja el documento abierto para que
+        `process_pdf` lo reutilice.
+
+        Returns:
+            {"valido", "patron", "layout", "anio", "periodo", "modalidad",
+             "carrera", "paginas", "filas_pagina", "segundos_estimados"}.
+            `valido` es False si ninguna línea coincide con los patrones.
+
+        Raises:
+            PDFProcessingError: si el archivo no se puede abrir como PDF.
         """
-        line = line.strip()
-        if not line:
-            return None
+        try:
+            if self._pdf is None:
+                self._pdf = pdfplumber.open(self.pdf_source)
+            started = time.perf_counter()
+            total_pages = len(self._pdf.pages)
+            text = self._pdf.pages[0].extract_text() if total_pages else ""
+        except Exception as e:
+            self.close()
+            raise PDFProcessingError(f"Error reading PDF: {e}")
 
-        for pattern_name, pattern, extractor in PatternManager.get_extraction_patterns():
-            if match := pattern.match(line):
-                try:
-                    dni, name, score, condition = extractor(match)
+        text = text or ""
+        patterns = PatternManager.get_extraction_patterns()
+        matches: Counter = Counter()
+        for line in text.split("\n"):
+            line = line.strip()
+            for pattern_name, pattern, _ in patterns:
+                if line and pattern.match(line):
+                    matches[pattern_name] += 1
+                    break
 
-                    return {
-                        "dni": str(dni),
-                        "apellidos_nombres": TextCleaner.clean_name(name),
-                        "puntaje": TextCleaner.parse_score(score),
-                        "condicion": TextCleaner.clean_condition(condition),
-                    }
-                except Exception as e:
-                    raise PatternMatchError(f"Error processing pattern {pattern_name}: {e}")
+        text_upper = text.upper()
+        metadata = core.parse_metadata(text_upper, text_upper.split("\n"))
+        page_seconds = time.perf_counter() - started
+        pattern_name = matches.most_common(1)[0][0] if matches else ""
 
-        return None
+        return {
+            "valido": bool(matches),
+            "patron": pattern_name,
+            "layout": PatternManager.get_layout(pattern_name),
+            "anio": metadata["year"],
+            "periodo": metadata["period"],
+            "modalidad": metadata["modality"],
+            "carrera": metadata["career"],
+            "paginas": total_pages,
+            "filas_pagina": sum(matches.values()),
+            "segundos_estimados": round(page_seconds * total_pages, 1),
+        }
 
-    def _add_metadata(self, record: Dict[str, str]) -> Dict[str, str]:
+    def _get_state(self) -> Dict[str, Any]:
+        """Estado de metadata y contador necesario para continuar el documento."""
+        return self.context.get_state()
+
+    def _set_state(self, state: Dict[str, Any]) -> None:
+        self.context.set_state(state)
+
+    def extract_metadata(self, text: str) -> None:
+        """Extrae toda la metadata de la página actual (ver `core.extract_metadata`)."""
+        core.extract_metadata(self.context, text)
+
+    def process_line(self, line: str) -> Optional[Dict[str, str]]:
         """
-        Agrega metadata persistente a un registro.
+        Procesa una línea de resultados usando patrones priorizados.
         """
-        metadata_fields = {
-            "modalidad_ingreso": self.modality,
-            "carrera": self.career,  #Usar la carrera obligatorio
-            "anio": str(self.year),
-            "periodo": str(self.period),
-            "orden_original": self.order,
-        }
+        return core.process_line(line)
 
-        return {**record, **metadata_fields}
+    def _add_metadata(self, record: Dict[str, str]) -> Dict[str, str]:
+        return core.add_metadata(self.context, record)
 
     def process_page(self, page) -> List[Dict[str, str]]:
         """
         Procesa una página completa.
         """
-        text = page.extract_text()
-        if not text:
-            return []
-
-        self.extract_metadata(text)
-        records = []
+        return core.process_page(self.context, page)
 
-        for line in text.split("\n"):
-            if line_result := self.process_line(line):
-                complete_record = self._add_metadata(line_result)
-                records.append(complete_record)
-                self.order += 1
-
-        return records
+    def _run_page_isolated(
+        self, pdf, page_number: int, worker: Optional[PageWorker]
+    ) -> List[Dict[str, str]]:
+        return core.run_page_isolated(self.context, pdf, page_number, worker)
 
-    def process_pdf(self, progress_callback: Optional[Callable[[int, int, int], None]] = None) -> None:
+    def process_pdf(
+        self,
+        progress_callback: Optional[Callable[[int, int, int], None]] = None,
+        checkpoint_dir: Optional[Union[str, Path]] = None,
+        page_timeout: Optional[float] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        learn_columns: bool = True,
+    ) -> List[Dict[str, Any]]:
         """
         Procesa el PDF completo con callback de progreso opcional.
+
+        Una página que falla no detiene el documento: se registra en el reporte
+        de errores y se continúa con la siguiente.
         
         Args:
             progress_callback: Función opcional que recibe (current_page, total_pages, total_records)
                              Se llama después de procesar cada página.
+            checkpoint_dir: Directorio opcional de avance. Cada página terminada se guarda
+                            ahí y, si el proceso se interrumpe, una nueva ejecución con el
+                            mismo PDF continúa desde la última página terminada.
+            page_timeout: Segundos máximos por página. Si se indica, cada página se procesa
+                          en un proceso worker que se termina al exceder el límite.
+            page_range: (primera, última) página a procesar, ambas incluidas. El contador
+                        `order` continúa desde el estado actual (1 en un extractor nuevo).
+            learn_columns: Con el parser "words", recuperar de las páginas anteriores
+                           las columnas vigentes al inicio. Se omite cuando ya se
+                           cargaron en el estado (p. ej. desde un manifiesto de rango).
+
+        Returns:
+            Reporte de páginas fallidas (pagina, error, segundos), también disponible
+            en `page_errors`.
         """
+        checkpoint = None
+        last_page = 0
+
+        if checkpoint_dir is not None:
+            checkpoint_key = self.get_pdf_hash()
+            if page_range is not None:
+                checkpoint_key += "-{}-{}".format(*page_range)
+            checkpoint = CheckpointStore(checkpoint_dir, checkpoint_key)
+            last_page, saved_records, saved_state, saved_errors = checkpoint.load()
+            if last_page:
+                self.data.extend(saved_records)
+                self.page_errors.extend(saved_errors)
+                self._set_state(saved_state)
+
+        worker = None
+        shared_buffer = None
+        if page_timeout:
+            # El worker recibe la ruta o un bloque de memoria compartida, nunca bytes serializados
+            if self.pdf_path is not None:
+                handle = ("path", str(self.pdf_path), 0)
+            else:
+                shared_buffer = SharedPDFBuffer(self.pdf_source)
+                handle = shared_buffer.handle
+            worker = PageWorker(handle, page_timeout, self.get_options())
+
         try:
-            with pdfplumber.open(self.pdf_source) as pdf:
-                total_pages = len(pdf.pages)
+            with self._open_pdf() as pdf:
+                first_page, end_page = page_range or (1, len(pdf.pages))
+                if not 1 <= first_page <= end_page <= len(pdf.pages):
+                    raise ValueError(f"Rango de páginas fuera del documento: {first_page}-{end_page}")
+                total_pages = end_page - first_page + 1
+
+                # Columnas vigentes al inicio del rango o al continuar un avance
+                # guardado sin ellas (versiones anteriores del checkpoint)
+                start_page = max(last_page + 1, first_page)
+                if (
+                    learn_columns and start_page > 1 and self.parser == "words"
+                    and self.context.word_parser.columns is None
+                ):
+                    core.learn_columns_before(self.context, pdf, start_page)
+
+                if last_page and progress_callback:
+                    progress_callback(last_page - first_page + 1, total_pages, len(self.data))
 
-                for idx, page in enumerate(pdf.pages, 1):
-                    records = self.process_page(page)
+                for idx in range(start_page, end_page + 1):
+                    errors_before = len(self.page_errors)
+                    records = self._run_page_isolated(pdf, idx, worker)
                     self.data.extend(records)
+
+                    if checkpoint:
+                        checkpoint.save_page(
+                            idx, records, self._get_state(), self.page_errors[errors_before:]
+                        )
                     
                     if progress_callback:
-                        progress_callback(idx, total_pages, len(self.data))
+                        progress_callback(idx - first_page + 1, total_pages, len(self.data))
+
+            if checkpoint:
+                checkpoint.clear()
 
         except Exception as e:
-            raise PDFProcessingError(f"Error processing PDF: {e}")
+            raise PDFProcessingError(f"Error processing PDF: {e}") from e
+
+        finally:
+            if worker:
+                worker.close()
+            if shared_buffer:
+                shared_buffer.close()
+            self._release_mapping()
 
-    def export_to_excel(self, output_path: Union[str, Path] = None) -> Union[Path, io.BytesIO]:
+        return self.page_errors
+
+    def export_to_excel(
+        self, output_path: Union[str, Path] = None, analytics: bool = False
+    ) -> Union[Path, io.BytesIO]:
         """
-        Exporta datos a Excel.
+        Exporta datos a Excel, opcionalmente con puestos y hoja de resumen.
         """
         if not self.data:
             raise ValueError("No hay datos para exportar")
 
+        from file_handler.file_handler import FileHandler
+
         try:
             return FileHandler.export_to_excel(
                 self.data, 
                 output_path,
                 self.year,
-                self.period
+                self.period,
+                analytics=analytics,
             )
         except Exception as e:
             raise PDFProcessingError(f"Error exporting to Excel: {e}")
 
     def get_filename(self) -> str:
         """Genera el nombre del archivo de salida."""
+        from file_handler.file_handler import FileHandler
+
         return FileHandler.generate_filename(self.year, self.period)
\ No newline at end of file
@@ -0,0 +1,141 @@
+import multiprocessing as mp
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.exceptions import PDFProcessingError, PageTimeoutError
+
+# Tiempo máximo para que un worker nuevo importe dependencias y abra el PDF
+STARTUP_TIMEOUT = 60.0
+
+
+def _worker_main(conn, source_handle: Tuple[str, str, int], options: Dict[str, Any]) -> None:
+    """
+    Bucle del proceso worker: abre el PDF una sola vez y procesa las páginas
+    que le pide el proceso principal con el estado que recibe.
+
+    `source_handle` es ("path", ruta, 0) o ("shm", nombre, tamaño): el PDF se
+    lee del archivo mapeado o de la memoria compartida, sin copiarlo.
+    """
+    import pdfplumber
+    from extractor.extractor import PDFExtractor
+    from extractor.pdf_source import attach_shared
+
+    kind, location, size = source_handle
+    shm = None
+    if kind == "shm":
+        shm = attach_shared(location)
+        extractor = PDFExtractor(shm.buf[:size], **options)
+    else:
+        extractor = PDFExtractor(location, **options)
+
+    with pdfplumber.open(extractor.pdf_source) as pdf:
+        conn.send(("ready", None, None))
+
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+
+            page_number, state = request
+            extractor._set_state(state)
+            try:
+                records = extractor.process_page(pdf.pages[page_number - 1])
+                conn.send(("ok", records, extractor._get_state()))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}", None))
+
+    extractor.close()
+    if shm is not None:
+        extractor.pdf_source.close()
+        shm.close()
+
+
+class PageWorker:
+    """
+    Procesa páginas en un proceso separado que puede terminarse si una página
+    excede el tiempo límite. El worker se reinicia en la siguiente página.
+    """
+
+    def __init__(
+        self,
+        source_handle: Tuple[str, str, int],
+        timeout: float,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.source_handle = source_handle
+        self.timeout = timeout
+        self.options = options or {}
+        self._context = mp.get_context("spawn")
+        self._process = None
+        self._conn = None
+
+    def _start(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main, args=(child_conn, self.source_handle, self.options), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+        if not self._conn.poll(STARTUP_TIMEOUT):
+            self.kill()
+            raise PageTimeoutError("El worker no pudo abrir el PDF a tiempo")
+        self._receive()
+
+    def _receive(self) -> Tuple[str, Any, Optional[Dict[str, Any]]]:
+        try:
+            return self._conn.recv()
+        except (EOFError, OSError):
+            self.kill()
+            raise PDFProcessingError("El worker terminó inesperadamente")
+
+    def run_page(
+        self, page_number: int, state: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Procesa una página en el worker.
+
+        Returns:
+            (registros de la página, estado resultante)
+        """
+        if self._process is None:
+            self._start()
+
+        self._conn.send((page_number, state))
+
+        if not self._conn.poll(self.timeout):
+            self.kill()
+            raise PageTimeoutError(
+                f"La página {page_number} excedió el límite de {self.timeout} s"
+            )
+
+        status, payload, new_state = self._receive()
+        if status == "error":
+            raise PDFProcessingError(payload)
+
+        return payload, new_state
+
+    def kill(self) -> None:
+        """Termina el worker actual sin esperar a la página en curso."""
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self) -> None:
+        """Detiene el worker de forma ordenada."""
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+                self._process.join(timeout=5)
+            except (BrokenPipeError, OSError):
+                pass
+            self.kill()
+
+    def __enter__(self) -> "PageWorker":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
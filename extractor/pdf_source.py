@@ -0,0 +1,113 @@
+import io
+import mmap
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Tuple, Union
+
+from utils.exceptions import PDFProcessingError
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Archivo de solo lectura sobre un buffer existente (bytes, memoryview,
+    memoria compartida) sin copiar su contenido.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(end, self._pos)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = len(self._view) + offset
+        else:
+            raise ValueError(f"whence no válido: {whence}")
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def getbuffer(self) -> memoryview:
+        return self._view[:]
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+def source_view(source: Any) -> memoryview:
+    """Vista sin copia del contenido de una fuente preparada por `PDFExtractor`."""
+    if isinstance(source, (io.BytesIO, BufferReader)):
+        return source.getbuffer()
+    return memoryview(source)
+
+
+def open_mapped(path: Union[str, Path]) -> mmap.mmap:
+    """
+    Mapea un archivo en memoria en modo lectura; el SO comparte sus páginas.
+
+    Raises:
+        PDFProcessingError: si el archivo está vacío o no se puede mapear.
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError) as e:
+            raise PDFProcessingError(f"Error reading PDF: {e}")
+
+
+class SharedPDFBuffer:
+    """
+    Copia única del PDF en memoria compartida para los procesos worker.
+    Los workers reciben solo el nombre del bloque (`handle`), no los bytes.
+    """
+
+    def __init__(self, source: Any) -> None:
+        with source_view(source) as view:
+            self.size = len(view)
+            self._shm = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+            self._shm.buf[:self.size] = view
+
+    @property
+    def handle(self) -> Tuple[str, str, int]:
+        return ("shm", self._shm.name, self.size)
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedPDFBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach_shared(name: str) -> shared_memory.SharedMemory:
+    """
+    Abre en un worker un bloque creado por `SharedPDFBuffer`. El bloque
+    pertenece al proceso principal, que es el único que debe liberarlo
+    (los workers `spawn` comparten su resource tracker).
+    """
+    return shared_memory.SharedMemory(name=name)
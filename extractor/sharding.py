@@ -0,0 +1,266 @@
+"""
+Procesamiento de un PDF por rangos de páginas, repartible entre varios nodos.
+
+    python -m extractor.sharding plan archivo.pdf unidades/ --pages 50
+    python -m extractor.sharding run unidades/unidad-0001.json [--pdf ruta_local]
+    python -m extractor.sharding merge unidades/ --output resultado.xlsx
+
+`plan` escribe un manifiesto por rango, `run` procesa un manifiesto en
+cualquier nodo con el mismo paquete y deja un resultado parcial a su lado, y
+`merge` une los parciales en el mismo resultado que `process_pdf` completo.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+MANIFEST_GLOB = "unidad-*.json"
+PARTIAL_SUFFIX = ".parcial"
+
+
+def _write_json(path: Path, content: Dict[str, Any]) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(content, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _partial_path(manifest_path: Path) -> Path:
+    return manifest_path.with_name(manifest_path.stem + PARTIAL_SUFFIX + ".json")
+
+
+def plan_units(
+    pdf_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    pages_per_unit: int = 50,
+    options: Optional[Dict[str, Any]] = None,
+) -> List[Path]:
+    """
+    Divide el PDF en rangos de `pages_per_unit` páginas y escribe un
+    manifiesto por rango. Con el parser "words" cada manifiesto incluye las
+    columnas vigentes al inicio de su rango.
+
+    Returns:
+        Rutas de los manifiestos, en orden de páginas.
+    """
+    import pdfplumber
+    from extractor.extractor import PDFExtractor
+
+    if pages_per_unit < 1:
+        raise ValueError("pages_per_unit debe ser mayor que cero")
+
+    extractor = PDFExtractor(pdf_path, **(options or {}))
+    with pdfplumber.open(extractor.pdf_source) as pdf:
+        total_pages = len(pdf.pages)
+        first_pages = list(range(1, total_pages + 1, pages_per_unit))
+        columns = {}
+        if extractor.parser == "words":
+            columns = _columns_at(extractor.context.word_parser, pdf, first_pages)
+    pdf_hash = extractor.get_pdf_hash()
+    extractor.close()
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifests = []
+
+    for unit, first_page in enumerate(first_pages, start=1):
+        manifest_path = output_dir / f"unidad-{unit:04d}.json"
+        manifest = {
+            "unidad": unit,
+            "pdf": str(Path(pdf_path).resolve()),
+            "pdf_hash": pdf_hash,
+            "primera_pagina": first_page,
+            "ultima_pagina": min(first_page + pages_per_unit - 1, total_pages),
+            "total_paginas": total_pages,
+            "opciones": extractor.get_options(),
+        }
+        if first_page in columns:
+            manifest["columnas"] = columns[first_page]
+        _write_json(manifest_path, manifest)
+        manifests.append(manifest_path)
+
+    return manifests
+
+
+def _columns_at(word_parser, pdf, first_pages: List[int]) -> Dict[int, Any]:
+    """
+    Columnas del parser por coordenadas vigentes al inicio de cada rango: las
+    del último encabezado de tabla anterior. Se recorre el documento una sola
+    vez en lugar de que cada rango relea las páginas previas.
+    """
+    columns = {}
+    pending = iter(first_pages)
+    next_first = next(pending, None)
+
+    for page_number, page in enumerate(pdf.pages, start=1):
+        while next_first == page_number:
+            columns[next_first] = word_parser.columns
+            next_first = next(pending, None)
+        if next_first is None:
+            break
+        for row in word_parser.group_rows(page.extract_words()):
+            word_parser.learn_columns(row)
+        page.close()
+
+    return columns
+
+
+def run_unit(
+    manifest_path: Union[str, Path],
+    pdf_path: Optional[Union[str, Path]] = None,
+    page_timeout: Optional[float] = None,
+) -> Path:
+    """
+    Procesa el rango de un manifiesto y escribe su resultado parcial: estado
+    inicial y final, registros con `orden_original` local al rango (desde 1)
+    y páginas con error.
+
+    Args:
+        pdf_path: Copia local del PDF si no está en la ruta del manifiesto.
+
+    Raises:
+        ValueError: si el PDF no coincide con el hash del manifiesto.
+    """
+    from extractor.extractor import PDFExtractor
+
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    extractor = PDFExtractor(pdf_path or manifest["pdf"], **manifest["opciones"])
+    if extractor.get_pdf_hash() != manifest["pdf_hash"]:
+        raise ValueError(f"El PDF no corresponde al manifiesto {manifest_path.name}")
+
+    if "columnas" in manifest:
+        extractor._set_state({"columns": manifest["columnas"]})
+
+    start_state = extractor._get_state()
+    page_errors = extractor.process_pdf(
+        page_timeout=page_timeout,
+        page_range=(manifest["primera_pagina"], manifest["ultima_pagina"]),
+        learn_columns="columnas" not in manifest,
+    )
+
+    partial_path = _partial_path(manifest_path)
+    _write_json(partial_path, {
+        **manifest,
+        "estado_inicial": start_state,
+        "estado_final": extractor._get_state(),
+        "registros": extractor.data,
+        "errores": page_errors,
+    })
+    return partial_path
+
+
+def merge_partials(directory: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Une los parciales de todos los manifiestos del directorio. Renumera
+    `orden_original` de forma continua, igual que una ejecución completa.
+
+    Returns:
+        {"data", "page_errors", "year", "period", "pdf_hash"}
+
+    Raises:
+        ValueError: si falta un parcial o los rangos no cubren el documento.
+    """
+    directory = Path(directory)
+    manifests = sorted(
+        path for path in directory.glob(MANIFEST_GLOB) if PARTIAL_SUFFIX not in path.name
+    )
+    if not manifests:
+        raise ValueError(f"No hay manifiestos en {directory}")
+
+    partials = []
+    for manifest_path in manifests:
+        partial_path = _partial_path(manifest_path)
+        if not partial_path.exists():
+            raise ValueError(f"Falta el resultado parcial de {manifest_path.name}")
+        with open(partial_path, encoding="utf-8") as f:
+            partials.append(json.load(f))
+    partials.sort(key=lambda partial: partial["primera_pagina"])
+
+    expected_page = 1
+    for partial in partials:
+        if partial["pdf_hash"] != partials[0]["pdf_hash"]:
+            raise ValueError("Los parciales provienen de PDFs distintos")
+        if partial["primera_pagina"] != expected_page:
+            raise ValueError(f"Falta el rango que inicia en la página {expected_page}")
+        expected_page = partial["ultima_pagina"] + 1
+    if expected_page != partials[0]["total_paginas"] + 1:
+        raise ValueError(f"Falta el rango que inicia en la página {expected_page}")
+
+    data: List[Dict[str, Any]] = []
+    page_errors: List[Dict[str, Any]] = []
+    year = period = ""
+
+    for partial in partials:
+        offset = len(data)
+        for record in partial["registros"]:
+            data.append({**record, "orden_original": record["orden_original"] + offset})
+        page_errors.extend(partial["errores"])
+
+        # La metadata se lee de cada página; un rango cuyo estado no cambió
+        # (páginas sin texto) conserva el de los rangos anteriores
+        start_state, end_state = partial["estado_inicial"], partial["estado_final"]
+        if (end_state["year"], end_state["period"]) != (start_state["year"], start_state["period"]):
+            year, period = end_state["year"], end_state["period"]
+
+    return {
+        "data": data,
+        "page_errors": page_errors,
+        "year": year,
+        "period": period,
+        "pdf_hash": partials[0]["pdf_hash"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Procesamiento de un PDF por rangos de páginas")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="Divide el PDF en manifiestos por rango")
+    plan.add_argument("pdf", type=Path)
+    plan.add_argument("output_dir", type=Path)
+    plan.add_argument("--pages", type=int, default=50, help="Páginas por unidad")
+    plan.add_argument("--parser", choices=("text", "words"), default="text")
+
+    run = commands.add_parser("run", help="Procesa un manifiesto")
+    run.add_argument("manifest", type=Path)
+    run.add_argument("--pdf", type=Path, help="Copia local del PDF")
+    run.add_argument("--page-timeout", type=float)
+
+    merge = commands.add_parser("merge", help="Une los resultados parciales")
+    merge.add_argument("directory", type=Path)
+    merge.add_argument("--output", type=Path, help="Excel de salida")
+    merge.add_argument("--json", type=Path, help="Registros unidos en JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "plan":
+        options = {"parser": args.parser}
+        manifests = plan_units(args.pdf, args.output_dir, args.pages, options)
+        print(f"{len(manifests)} unidades en {args.output_dir}")
+
+    elif args.command == "run":
+        partial_path = run_unit(args.manifest, args.pdf, args.page_timeout)
+        print(f"Resultado parcial: {partial_path}")
+
+    else:
+        from file_handler.file_handler import FileHandler
+
+        merged = merge_partials(args.directory)
+        output = args.output or args.directory / FileHandler.generate_filename(
+            merged["year"], merged["period"]
+        )
+        FileHandler.export_to_excel(merged["data"], output)
+        if args.json:
+            _write_json(args.json, merged)
+        print(f"{len(merged['data'])} registros, {len(merged['page_errors'])} páginas con error -> {output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
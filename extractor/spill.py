@@ -0,0 +1,91 @@
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# Bytes estimados por registro además del texto de sus valores (dict y objetos str)
+RECORD_OVERHEAD = 600
+
+
+class SpilledRecords:
+    """
+    Lista de registros con presupuesto de memoria. Al superar `budget_bytes`
+    los registros acumulados se escriben como un fragmento Parquet en un
+    directorio temporal y se liberan; `scan()` los vuelve a leer de forma
+    perezosa junto con los que siguen en memoria.
+    """
+
+    def __init__(self, budget_bytes: int, spill_dir: Optional[Union[str, Path]] = None) -> None:
+        self.budget_bytes = budget_bytes
+        # TemporaryDirectory se elimina al cerrar o al liberar el objeto
+        self._tmp = tempfile.TemporaryDirectory(prefix="extractor-spill-", dir=spill_dir)
+        self.chunks: List[Path] = []
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_bytes = 0
+        self._spilled = 0
+
+    @staticmethod
+    def _estimate(record: Dict[str, Any]) -> int:
+        return RECORD_OVERHEAD + sum(len(str(value)) for value in record.values())
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self._pending.append(record)
+        self._pending_bytes += self._estimate(record)
+        if self._pending_bytes > self.budget_bytes:
+            self.flush()
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    @staticmethod
+    def _schema(records: List[Dict[str, Any]]):
+        import polars as pl
+
+        keys = dict.fromkeys(key for record in records for key in record)
+        return {key: pl.Int64 if key == "orden_original" else pl.Utf8 for key in keys}
+
+    def flush(self) -> None:
+        """Escribe en disco los registros en memoria."""
+        if not self._pending:
+            return
+
+        import polars as pl
+
+        chunk = Path(self._tmp.name) / f"chunk-{len(self.chunks):05d}.parquet"
+        pl.DataFrame(self._pending, schema=self._schema(self._pending)).write_parquet(chunk)
+        self.chunks.append(chunk)
+        self._spilled += len(self._pending)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def scan(self):
+        """LazyFrame con todos los registros: fragmentos en disco y los pendientes."""
+        import polars as pl
+
+        frames = [pl.scan_parquet(chunk) for chunk in self.chunks]
+        if self._pending:
+            frames.append(pl.DataFrame(self._pending, schema=self._schema(self._pending)).lazy())
+        if not frames:
+            return pl.LazyFrame()
+        return pl.concat(frames, how="diagonal")
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._pending)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        import polars as pl
+
+        for chunk in self.chunks:
+            yield from pl.read_parquet(chunk).iter_rows(named=True)
+        yield from self._pending
+
+    def close(self) -> None:
+        """Elimina los fragmentos en disco."""
+        self._tmp.cleanup()
+        self.chunks = []
+        self._pending = []
+        self._pending_bytes = 0
+        self._spilled = 0
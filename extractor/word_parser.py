@@ -0,0 +1,127 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from pdfplumber.utils import cluster_objects
+
+from utils.text_cleaner import TextCleaner
+
+# Palabras del encabezado de la tabla que identifican cada columna de interés
+HEADER_KEYWORDS = {
+    "dni": ("DNI", "D.N.I.", "D.N.I", "DOCUMENTO"),
+    "name": ("APELLIDOS", "NOMBRES", "POSTULANTE"),
+    "score": ("PUNTAJE", "PUNTAJES", "NOTA"),
+    "condition": ("CONDICION", "CONDICIÓN", "OBSERVACION", "OBSERVACIÓN", "SITUACION", "SITUACIÓN", "RESULTADO"),
+}
+
+VALID_CONDITIONS = {"INGRESO", "NO INGRESO", "AUSENTE", "ANULADO"}
+DNI_PATTERN = re.compile(r"\d{6,9}")
+
+# Tolerancia vertical (pt) para considerar dos palabras en la misma fila
+ROW_TOLERANCE = 3.0
+# Separación mínima entre palabras del encabezado, relativa a su altura, para iniciar otra columna
+COLUMN_GAP_RATIO = 0.8
+# Holgura (pt) a la izquierda del inicio de cada columna del encabezado
+COLUMN_SLACK = 4.0
+
+
+class WordRowParser:
+    """
+    Parser de filas por coordenadas. Agrupa las palabras de la página en filas
+    por su posición vertical y asigna cada palabra a una columna según las
+    franjas horizontales aprendidas de la fila de encabezado.
+    """
+
+    def __init__(self) -> None:
+        # Franjas de columnas ordenadas por x: {"x0": inicio, "role": rol o None}
+        self.columns: Optional[List[Dict[str, Any]]] = None
+
+    @staticmethod
+    def group_rows(words: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Agrupa palabras en filas por `top` y las ordena de izquierda a derecha."""
+        rows = cluster_objects(words, "top", ROW_TOLERANCE)
+        return [sorted(row, key=lambda word: word["x0"]) for row in rows]
+
+    @staticmethod
+    def _role(text: str) -> Optional[str]:
+        text = text.upper()
+        for role, keywords in HEADER_KEYWORDS.items():
+            if text in keywords:
+                return role
+        return None
+
+    def learn_columns(self, row: List[Dict[str, Any]]) -> bool:
+        """
+        Aprende las franjas de columnas si la fila es un encabezado con DNI,
+        nombre y condición. Retorna True si la fila era un encabezado.
+        """
+        roles = {self._role(word["text"]) for word in row}
+        if not {"dni", "name", "condition"} <= roles:
+            return False
+
+        columns: List[Dict[str, Any]] = []
+        previous = None
+        for word in row:
+            gap_limit = (word["bottom"] - word["top"]) * COLUMN_GAP_RATIO
+            if previous is None or word["x0"] - previous["x1"] > gap_limit:
+                columns.append({"x0": word["x0"] - COLUMN_SLACK, "role": None})
+            if role := self._role(word["text"]):
+                columns[-1]["role"] = columns[-1]["role"] or role
+            previous = word
+
+        self.columns = columns
+        return True
+
+    def _column_role(self, word: Dict[str, Any]) -> Optional[str]:
+        center = (word["x0"] + word["x1"]) / 2
+        role = None
+        for column in self.columns:
+            if center < column["x0"]:
+                break
+            role = column["role"]
+        return role
+
+    def parse_row(self, row: List[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        """Convierte una fila de palabras en registro, o None si no es una fila de datos."""
+        cells: Dict[str, List[str]] = {"dni": [], "name": [], "score": [], "condition": []}
+        for word in row:
+            if role := self._column_role(word):
+                cells[role].append(word["text"])
+
+        dni = "".join(cells["dni"])
+        if not DNI_PATTERN.fullmatch(dni):
+            return None
+
+        condition = TextCleaner.clean_condition(" ".join(cells["condition"]))
+        if condition not in VALID_CONDITIONS:
+            return None
+
+        return {
+            "dni": dni,
+            "apellidos_nombres": TextCleaner.clean_name(" ".join(cells["name"])),
+            "puntaje": TextCleaner.parse_score(" ".join(cells["score"])),
+            "condicion": condition,
+        }
+
+    def parse_page(self, page) -> Optional[Dict[str, Any]]:
+        """
+        Lee las palabras de la página una sola vez.
+
+        Returns:
+            {"text": líneas de la página, "records": registros} o None si aún no
+            se conoce el encabezado de la tabla.
+        """
+        rows = self.group_rows(page.extract_words())
+        lines = []
+        records = []
+
+        for row in rows:
+            lines.append(" ".join(word["text"] for word in row))
+            if self.learn_columns(row) or self.columns is None:
+                continue
+            if record := self.parse_row(row):
+                records.append(record)
+
+        if self.columns is None:
+            return None
+
+        return {"text": "\n".join(lines), "records": records}
@@ -1,2 +1,23 @@
-from .file_handler import *
-from .clean_file import *
+"""
+Limpieza y exportación de resultados. Las clases se importan a demanda:
+pandas y polars solo se cargan cuando se usa la etapa que los necesita.
+"""
+import importlib
+
+_EXPORTS = {
+    "FileHandler": ".file_handler",
+    "DataFrameCleaner": ".clean_file",
+    "ResultsAnalytics": ".analytics",
+    "DNIIndex": ".dni_index",
+    "HistoricalStore": ".historical_store",
+    "ResultCache": ".result_cache",
+    "IncrementalWorkbook": ".workbook_append",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
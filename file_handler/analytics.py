@@ -0,0 +1,67 @@
+from typing import List
+
+import polars as pl
+
+# Claves de agrupación, en orden; se usan las que existan en el DataFrame
+GROUP_KEYS = ["AÑO", "PERIODO", "CARRERA", "MODALIDAD"]
+ADMITTED = "INGRESO"
+QUANTILES = (25, 50, 75)
+
+
+class ResultsAnalytics:
+    """
+    Métricas por carrera y modalidad calculadas con expresiones de Polars
+    sobre el DataFrame limpio: puesto, percentil y puntaje mínimo de ingreso.
+    Funciona igual sobre un PDF o sobre el dataset histórico consolidado.
+    """
+
+    @staticmethod
+    def group_keys(df: pl.DataFrame) -> List[str]:
+        return [key for key in GROUP_KEYS if key in df.columns]
+
+    @staticmethod
+    def _score() -> pl.Expr:
+        # AUSENTE / ANULADO no tienen puntaje numérico y quedan como nulos
+        return pl.col("PUNTAJE").cast(pl.Utf8).str.strip_chars().cast(pl.Float64, strict=False)
+
+    @staticmethod
+    def add_rankings(df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Agrega PUESTO (1 = mayor puntaje; empates comparten puesto) y
+        PERCENTIL dentro de cada grupo de `GROUP_KEYS`. Las filas sin
+        puntaje quedan nulas.
+        """
+        keys = ResultsAnalytics.group_keys(df)
+        score = ResultsAnalytics._score()
+        over = (lambda expr: expr.over(keys)) if keys else (lambda expr: expr)
+
+        return df.with_columns([
+            over(score.rank(method="min", descending=True)).cast(pl.UInt32).alias("PUESTO"),
+            over(score.rank(method="max") / score.count() * 100).round(2).alias("PERCENTIL"),
+        ])
+
+    @staticmethod
+    def summary(df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Una fila por grupo con postulantes, ingresantes, puntaje mínimo de
+        ingreso (corte), máximo, promedio y percentiles del puntaje.
+        """
+        keys = ResultsAnalytics.group_keys(df)
+        score = ResultsAnalytics._score()
+        admitted = pl.col("CONDICION") == ADMITTED
+
+        aggregations = [
+            pl.len().alias("POSTULANTES"),
+            admitted.sum().cast(pl.UInt32).alias("INGRESANTES"),
+            score.filter(admitted).min().alias("PUNTAJE_MINIMO_INGRESO"),
+            score.max().alias("PUNTAJE_MAXIMO"),
+            score.mean().round(3).alias("PUNTAJE_PROMEDIO"),
+        ] + [
+            score.quantile(q / 100, interpolation="linear").round(3).alias(f"PERCENTIL_{q}")
+            for q in QUANTILES
+        ]
+
+        if not keys:
+            return df.select(aggregations)
+        # Orden por texto aunque las claves sean categóricas (p. ej. leídas de Parquet)
+        return df.group_by(keys).agg(aggregations).sort([pl.col(key).cast(pl.Utf8) for key in keys])
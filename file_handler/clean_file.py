@@ -1,6 +1,28 @@
 import polars as pl
 from utils.mapeo import dict_area, dict_carreras, dict_facultades, mapping
 
+CONDICIONES = ("INGRESO", "NO INGRESO", "AUSENTE", "ANULADO")
+
+
+def _dominio(valores) -> list:
+    # Orden alfabético: ordenar por un Enum da el mismo resultado que por texto
+    return sorted(set(valores) | {""})
+
+
+# Columnas de pocos valores distintos. Solo CONDICION tiene un dominio cerrado
+# (los parsers descartan cualquier otra condición) y es Enum; en las demás
+# pueden aparecer valores sin entrada en `utils/mapeo.py`, que se conservan
+# tal cual como Categorical
+DOMINIOS_CATEGORICOS = {
+    "CONDICION": _dominio(CONDICIONES),
+    "AÑO": None,
+    "PERIODO": None,
+    "MODALIDAD": None,
+    "CARRERA": None,
+    "FACULTAD": None,
+    "AREA": None,
+}
+
 
 class DataFrameCleaner:
 
@@ -92,13 +114,28 @@ class DataFrameCleaner:
 
     @staticmethod
     def _ordenar_resultado(df: pl.DataFrame) -> pl.DataFrame:
-        if 'orden_original' in df.columns:
+        if 'orden_original' in df.collect_schema().names():
             return df.sort('orden_original')
         return df
 
+    @staticmethod
+    def tipos_categoricos(df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Convierte las columnas de `DOMINIOS_CATEGORICOS` a Enum sobre su
+        dominio o, sin dominio, a Categorical. Ningún valor se reemplaza.
+        """
+        columnas = []
+        for columna, dominio in DOMINIOS_CATEGORICOS.items():
+            if columna not in df.columns:
+                continue
+            dtype = pl.Categorical("lexical") if dominio is None else pl.Enum(dominio)
+            columnas.append(pl.col(columna).cast(pl.Utf8).cast(dtype))
+        return df.with_columns(columnas)
+
     @staticmethod
     def main_cleaner(df: pl.DataFrame) -> pl.DataFrame:
-        return (
+        # En un LazyFrame los tipos categóricos se aplican después de `collect`
+        df = (
             df
             .pipe(DataFrameCleaner._renombrar_columnas)
             .pipe(DataFrameCleaner._convertir_tipos_basicos)
@@ -108,6 +145,9 @@ class DataFrameCleaner:
             .pipe(DataFrameCleaner._agregar_facultad_y_area)
             .pipe(DataFrameCleaner._ordenar_resultado)
         )
+        if isinstance(df, pl.DataFrame):
+            df = DataFrameCleaner.tipos_categoricos(df)
+        return df
 
     @staticmethod
     def clean_dataframe(df: pl.DataFrame) -> pl.DataFrame:
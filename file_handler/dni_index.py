@@ -0,0 +1,136 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Union
+
+import polars as pl
+
+
+class DNIIndex:
+    """
+    Índice persistente (SQLite) de postulaciones por DNI entre documentos.
+    Cada documento se identifica por el hash de su PDF, de modo que volver a
+    procesarlo reemplaza sus postulaciones en lugar de duplicarlas.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documentos (
+            pdf_hash TEXT PRIMARY KEY,
+            anio TEXT,
+            periodo TEXT,
+            registros INTEGER,
+            actualizado TEXT
+        );
+        CREATE TABLE IF NOT EXISTS postulaciones (
+            dni TEXT NOT NULL,
+            pdf_hash TEXT NOT NULL,
+            anio TEXT,
+            periodo TEXT,
+            modalidad TEXT,
+            carrera TEXT,
+            puntaje TEXT,
+            condicion TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_postulaciones_dni ON postulaciones (dni);
+        CREATE INDEX IF NOT EXISTS idx_postulaciones_periodo ON postulaciones (anio, periodo, dni);
+        CREATE INDEX IF NOT EXISTS idx_postulaciones_documento ON postulaciones (pdf_hash);
+    """
+
+    _COLUMNAS = {
+        "DNI": "dni",
+        "AÑO": "anio",
+        "PERIODO": "periodo",
+        "MODALIDAD": "modalidad",
+        "CARRERA": "carrera",
+        "PUNTAJE": "puntaje",
+        "CONDICION": "condicion",
+    }
+
+    def __init__(self, db_path: Union[str, Path]) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(self._SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add_document(self, df: pl.DataFrame, pdf_hash: str) -> Dict[str, int]:
+        """
+        Agrega (o reemplaza) las postulaciones de un documento limpio.
+
+        Args:
+            df: DataFrame resultante de `DataFrameCleaner.main_cleaner`.
+            pdf_hash: Identificador del PDF de origen.
+
+        Returns:
+            DNIs repetidos dentro del documento con su número de apariciones.
+        """
+        df = df.select([
+            (pl.col(col).cast(pl.Utf8) if col in df.columns else pl.lit("")).alias(alias)
+            for col, alias in self._COLUMNAS.items()
+        ])
+        rows = [(pdf_hash, *row) for row in df.iter_rows()]
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM postulaciones WHERE pdf_hash = ?", (pdf_hash,))
+            conn.executemany(
+                "INSERT INTO postulaciones "
+                "(pdf_hash, dni, anio, periodo, modalidad, carrera, puntaje, condicion) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO documentos VALUES (?, ?, ?, ?, ?)",
+                (
+                    pdf_hash,
+                    df["anio"][0] if len(df) else "",
+                    df["periodo"][0] if len(df) else "",
+                    len(df),
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+
+        return self.duplicates(pdf_hash)
+
+    def duplicates(self, pdf_hash: str) -> Dict[str, int]:
+        """DNIs que aparecen más de una vez dentro de un mismo documento."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT dni, COUNT(*) AS veces FROM postulaciones "
+                "WHERE pdf_hash = ? GROUP BY dni HAVING COUNT(*) > 1",
+                (pdf_hash,),
+            ).fetchall()
+        return {row["dni"]: row["veces"] for row in rows}
+
+    def attempts(self, dni: str) -> List[Dict[str, str]]:
+        """Todas las postulaciones registradas de un DNI, en orden cronológico."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT anio, periodo, modalidad, carrera, puntaje, condicion "
+                "FROM postulaciones WHERE dni = ? ORDER BY anio, periodo",
+                (str(dni).strip(),),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def repeat_applicants(self, anio: str, periodo: str) -> List[str]:
+        """DNIs del periodo indicado que también postularon en otro periodo."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT p.dni FROM postulaciones p "
+                "WHERE p.anio = ? AND p.periodo = ? AND EXISTS ("
+                "    SELECT 1 FROM postulaciones o "
+                "    WHERE o.dni = p.dni AND (o.anio <> p.anio OR o.periodo <> p.periodo)"
+                ") ORDER BY p.dni",
+                (str(anio), str(periodo)),
+            ).fetchall()
+        return [row["dni"] for row in rows]
+
+    def remove_document(self, pdf_hash: str) -> None:
+        """Elimina un documento del índice."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM postulaciones WHERE pdf_hash = ?", (pdf_hash,))
+            conn.execute("DELETE FROM documentos WHERE pdf_hash = ?", (pdf_hash,))
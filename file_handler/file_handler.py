@@ -1,30 +1,47 @@
 import io
+import re
+import shutil
+import tempfile
+import zipfile
 import pandas as pd
-from typing import Dict, List, Union
+from typing import IO, Dict, List, Union
 from pathlib import Path
+from file_handler.analytics import ResultsAnalytics
 from file_handler.clean_file import DataFrameCleaner
+from file_handler.historical_store import HistoricalStore
+from file_handler.workbook_append import IncrementalWorkbook
 import polars as pl
 
 
+REQUIRED_COLUMNS = [
+    "dni",
+    "apellidos_nombres",
+    "puntaje",
+    "condicion",
+    "anio",
+    "periodo",
+    "modalidad_ingreso",
+    "carrera",
+    "orden_original",
+]
+# Columnas que siempre se exportan y las que solo se incluyen si tienen datos
+BASE_COLUMNS = ["dni", "apellidos_nombres", "puntaje", "condicion", "anio", "periodo"]
+OPTIONAL_COLUMNS = ["modalidad_ingreso", "carrera"]
+# Columnas por las que se puede dividir la exportación en varios archivos
+PARTITION_COLUMNS = ("CARRERA", "FACULTAD", "MODALIDAD")
+# Filas por lote al escribir el Excel en modo streaming
+STREAMING_BATCH_ROWS = 10_000
+# Tamaño hasta el que los archivos temporales de la exportación viven en memoria
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
 class FileHandler:
     @staticmethod
     def prepare_dataframe(data: List[Dict[str, str]]) -> pd.DataFrame:
         df = pd.DataFrame(data)
 
-        required_cols = [
-            "dni",
-            "apellidos_nombres",
-            "puntaje",
-            "condicion",
-            "anio",
-            "periodo",
-            "modalidad_ingreso",
-            "carrera",
-            "orden_original",
-        ]
-
         # Asegurar existencia de columnas
-        for col_name in required_cols:
+        for col_name in REQUIRED_COLUMNS:
             if col_name not in df.columns:
                 df[col_name] = ""
 
@@ -43,56 +60,257 @@ class FileHandler:
         """
         Determina qué columnas incluir dinámicamente basado en contenido.
         """
-        columnas_base = [
-            "dni",
-            "apellidos_nombres",
-            "puntaje",
-            "condicion",
-            "anio",
-            "periodo",
-        ]
-
-        columnas_opcionales = ["modalidad_ingreso", "carrera"]
         columnas_con_datos = [
-            col for col in columnas_opcionales if (df[col].astype(str) != "").any()
+            col for col in OPTIONAL_COLUMNS if (df[col].astype(str) != "").any()
         ]
 
-        return columnas_base + columnas_con_datos
+        return BASE_COLUMNS + columnas_con_datos
 
     @staticmethod
-    def export_to_excel(
-        data: List[Dict[str, str]],
-        output_path: Union[str, Path] = None,
-        anio: str = "",
-        periodo: str = "",
-    ) -> Union[Path, io.BytesIO]:
+    def prepare_lazy(lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Equivalente de `prepare_dataframe` en Polars, sin materializar los datos."""
+        present = lf.collect_schema().names()
+        return (
+            lf.with_columns([
+                pl.lit("").alias(col_name) for col_name in REQUIRED_COLUMNS if col_name not in present
+            ])
+            .sort("orden_original", maintain_order=True)
+            .with_columns([
+                pl.col(col_name).cast(pl.Utf8).fill_null("").replace("None", "")
+                for col_name in REQUIRED_COLUMNS if col_name != "orden_original"
+            ])
+        )
+
+    @staticmethod
+    def determine_columns_lazy(lf: pl.LazyFrame) -> List[str]:
+        """Equivalente de `determine_columns` que solo lee las columnas opcionales."""
+        con_datos = lf.select([(pl.col(col) != "").any() for col in OPTIONAL_COLUMNS]).collect()
+        return BASE_COLUMNS + [col for col in OPTIONAL_COLUMNS if con_datos[col][0]]
+
+    @staticmethod
+    def build_clean_dataframe(data: List[Dict[str, str]]) -> pl.DataFrame:
         """
-        Exporta datos a Excel con columnas dinámicas.
+        Prepara y limpia los registros extraídos. Es el mismo resultado que se
+        escribe en el Excel.
+
+        Los registros volcados a disco (`SpilledRecords`) se leen y limpian de
+        forma perezosa, sin pasar por pandas.
         """
         if not data:
             raise ValueError("No hay datos para exportar")
-        
+
+        if hasattr(data, "scan"):
+            lf = FileHandler.prepare_lazy(data.scan())
+            lf = lf.select(FileHandler.determine_columns_lazy(lf))
+            return DataFrameCleaner.tipos_categoricos(DataFrameCleaner.clean_dataframe(lf).collect())
+
         df = FileHandler.prepare_dataframe(data)
         columns = FileHandler.determine_columns(df)
         df = df[columns]
 
         pl_df = pl.from_pandas(df)
 
-        pl_df = DataFrameCleaner.clean_dataframe(pl_df)
+        return DataFrameCleaner.clean_dataframe(pl_df)
 
-        df_clean = pl_df.to_pandas()
+    @staticmethod
+    def export_to_excel(
+        data: List[Dict[str, str]],
+        output_path: Union[str, Path] = None,
+        anio: str = "",
+        periodo: str = "",
+        analytics: bool = False,
+    ) -> Union[Path, io.BytesIO]:
+        """
+        Exporta datos a Excel con columnas dinámicas. Con `analytics` agrega
+        PUESTO y PERCENTIL por carrera/modalidad y una hoja RESUMEN con los
+        puntajes de corte.
+        """
+        df_clean = FileHandler.build_clean_dataframe(data)
+        return FileHandler.write_excel(df_clean, output_path, analytics)
+
+    @staticmethod
+    def write_excel(
+        df_clean: pl.DataFrame,
+        output_path: Union[str, Path] = None,
+        analytics: bool = False,
+        low_memory: bool = False,
+    ) -> Union[Path, io.BytesIO]:
+        """
+        Escribe un DataFrame ya limpio con el mismo formato que `export_to_excel`.
+        Con `low_memory` las filas se escriben por lotes en modo streaming, sin
+        convertir el DataFrame a pandas.
+        """
+        sheets = {"Sheet1": df_clean}
+        if analytics:
+            sheets = {
+                "Sheet1": ResultsAnalytics.add_rankings(df_clean),
+                "RESUMEN": ResultsAnalytics.summary(df_clean),
+            }
 
         if output_path is None:
             buffer = io.BytesIO()
-            df_clean.to_excel(buffer, index=False, engine="openpyxl")
+            FileHandler._write_sheets(sheets, buffer, low_memory)
             buffer.seek(0)
             return buffer
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_clean.to_excel(output_path, index=False, engine="openpyxl")
+        FileHandler._write_sheets(sheets, output_path, low_memory)
         return output_path
 
+    @staticmethod
+    def _write_sheets(
+        sheets: Dict[str, pl.DataFrame],
+        target: Union[Path, IO[bytes]],
+        low_memory: bool = False,
+    ) -> None:
+        if low_memory:
+            FileHandler._write_sheets_streaming(sheets, target)
+            return
+
+        with pd.ExcelWriter(target, engine="openpyxl") as writer:
+            for sheet_name, df in sheets.items():
+                df.to_pandas().to_excel(writer, sheet_name=sheet_name, index=False)
+
+    @staticmethod
+    def _write_sheets_streaming(sheets: Dict[str, pl.DataFrame], target: Union[Path, IO[bytes]]) -> None:
+        """Hojas en modo write-only de openpyxl, con el mismo encabezado que pandas."""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, df in sheets.items():
+            sheet = workbook.create_sheet(sheet_name)
+            FileHandler.append_streaming_header(sheet, df.columns)
+
+            for batch in df.iter_slices(STREAMING_BATCH_ROWS):
+                for row in batch.iter_rows():
+                    sheet.append(row)
+
+        workbook.save(target)
+
+    @staticmethod
+    def append_streaming_header(sheet, columns: List[str]) -> None:
+        """Encabezado con el estilo de pandas en una hoja write-only de openpyxl."""
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, Side
+
+        thin = Side(style="thin")
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal="center", vertical="top")
+            header.append(cell)
+        sheet.append(header)
+
+    @staticmethod
+    def export_partitioned(
+        df_clean: pl.DataFrame,
+        by: str,
+        output_path: Union[str, Path] = None,
+        anio: str = "",
+        periodo: str = "",
+    ) -> Union[Path, IO[bytes]]:
+        """
+        Exporta un Excel por cada valor de `by` (CARRERA, FACULTAD o MODALIDAD)
+        dentro de un ZIP. Cada partición se filtra, escribe y copia al ZIP de
+        a una, así que la memoria no crece con la cantidad de particiones.
+
+        Returns:
+            Ruta del ZIP, o un archivo temporal posicionado al inicio.
+        """
+        if by not in PARTITION_COLUMNS:
+            raise ValueError(f"Columna de partición no válida: {by}")
+        if by not in df_clean.columns:
+            raise ValueError(f"Los datos no tienen la columna {by}")
+
+        if output_path is None:
+            target = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        else:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            target = open(output_path, "wb")
+
+        prefix = FileHandler.generate_filename(anio, periodo).removesuffix(".xlsx")
+        used_names = set()
+
+        try:
+            # xlsx ya está comprimido: se guarda sin volver a comprimir
+            with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED) as archive:
+                for value in df_clean.get_column(by).unique(maintain_order=True).to_list():
+                    if value is None:
+                        part = df_clean.filter(pl.col(by).is_null())
+                    else:
+                        part = df_clean.filter(pl.col(by) == value)
+
+                    name = FileHandler._partition_filename(prefix, value or f"SIN_{by}", used_names)
+                    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as part_file:
+                        FileHandler._write_sheets({"Sheet1": part}, part_file)
+                        part_file.seek(0)
+                        with archive.open(name, "w") as entry:
+                            shutil.copyfileobj(part_file, entry)
+        except Exception:
+            target.close()
+            raise
+
+        if output_path is not None:
+            target.close()
+            return output_path
+
+        target.seek(0)
+        return target
+
+    @staticmethod
+    def _partition_filename(prefix: str, value: str, used_names: set) -> str:
+        slug = re.sub(r"[^\w\-]+", "_", str(value)).strip("_") or "SIN_NOMBRE"
+        name = f"{prefix}-{slug}.xlsx"
+        counter = 2
+        while name in used_names:
+            name = f"{prefix}-{slug}-{counter}.xlsx"
+            counter += 1
+        used_names.add(name)
+        return name
+
+    @staticmethod
+    def append_to_store(
+        data: List[Dict[str, str]],
+        store_path: Union[str, Path],
+        pdf_hash: str,
+    ) -> List[Path]:
+        """
+        Agrega los resultados limpios al dataset histórico particionado por
+        AÑO/PERIODO, reemplazando lo que hubiera del mismo PDF.
+        """
+        df_clean = FileHandler.build_clean_dataframe(data)
+        return HistoricalStore(store_path).upsert(df_clean, pdf_hash)
+
+    @staticmethod
+    def export_to_workbook(
+        df_clean: pl.DataFrame,
+        workbook_path: Union[str, Path],
+        anio: str = "",
+        periodo: str = "",
+        replace: bool = False,
+    ) -> Path:
+        """
+        Agrega el periodo como una hoja nueva del libro consolidado (que se
+        crea si no existe) o, con `replace`, reemplaza la hoja del periodo.
+        Las hojas de los demás periodos no se vuelven a leer ni escribir.
+
+        Raises:
+            ValueError: si la hoja ya existe al agregar o no existe al reemplazar.
+        """
+        workbook = IncrementalWorkbook(workbook_path)
+        sheet_name = FileHandler.generate_sheet_name(anio, periodo)
+        if replace:
+            return workbook.replace_sheet(sheet_name, df_clean)
+        return workbook.add_sheet(sheet_name, df_clean)
+
+    @staticmethod
+    def generate_sheet_name(anio: str = "", periodo: str = "") -> str:
+        """Hoja de un periodo en el libro consolidado."""
+        return f"{anio or 'SIN_ANIO'}-{periodo or 'X'}"
 
     @staticmethod
     def generate_filename(anio: str = "", periodo: str = "") -> str:
@@ -0,0 +1,87 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+import polars as pl
+
+
+class HistoricalStore:
+    """
+    Dataset histórico local en Parquet particionado por AÑO/PERIODO
+    (`AÑO=2024/PERIODO=I/{pdf_hash}.parquet`).
+
+    Cada PDF escribe un archivo por partición identificado por su hash, así que
+    volver a procesarlo solo reemplaza sus propios archivos.
+
+    CONDICION se guarda como Enum y las demás columnas de pocos valores como
+    Categorical, con los valores de cada documento. AÑO y PERIODO, claves de
+    partición, se guardan como texto.
+    """
+
+    _HIVE_SCHEMA = {"AÑO": pl.Utf8, "PERIODO": pl.Utf8}
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+
+    def _partition_dir(self, anio: str, periodo: str) -> Path:
+        return self.root / f"AÑO={anio}" / f"PERIODO={periodo}"
+
+    def _document_files(self, pdf_hash: str) -> List[Path]:
+        return list(self.root.glob(f"AÑO=*/PERIODO=*/{pdf_hash}.parquet"))
+
+    def upsert(self, df: pl.DataFrame, pdf_hash: str) -> List[Path]:
+        """
+        Inserta o reemplaza los registros limpios de un documento.
+
+        Returns:
+            Archivos escritos, uno por partición AÑO/PERIODO presente en el documento.
+        """
+        stale_files = set(self._document_files(pdf_hash))
+        written: List[Path] = []
+        df = df.with_columns([
+            pl.col(col).cast(pl.Utf8) for col in self._HIVE_SCHEMA if col in df.columns
+        ])
+
+        for part in df.partition_by(["AÑO", "PERIODO"], maintain_order=True):
+            anio = part["AÑO"][0] or ""
+            periodo = part["PERIODO"][0] or ""
+
+            target_dir = self._partition_dir(anio, periodo)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            target = target_dir / f"{pdf_hash}.parquet"
+            tmp_target = target.with_suffix(".parquet.tmp")
+
+            # Escritura atómica: los lectores nunca ven un archivo a medias
+            part.write_parquet(tmp_target)
+            os.replace(tmp_target, target)
+
+            written.append(target)
+            stale_files.discard(target)
+
+        for stale in stale_files:
+            stale.unlink(missing_ok=True)
+
+        return written
+
+    def remove(self, pdf_hash: str) -> None:
+        """Elimina los registros de un documento."""
+        for path in self._document_files(pdf_hash):
+            path.unlink(missing_ok=True)
+
+    def scan(self) -> pl.LazyFrame:
+        """
+        Consulta perezosa sobre todo el dataset. Los filtros por AÑO/PERIODO
+        descartan particiones completas sin leerlas.
+        """
+        return pl.scan_parquet(
+            str(self.root / "**" / "*.parquet"),
+            hive_partitioning=True,
+            hive_schema=self._HIVE_SCHEMA,
+        )
+
+    def read_period(self, anio: str, periodo: Optional[str] = None) -> pl.DataFrame:
+        """Lee un año (y opcionalmente un periodo) del dataset."""
+        query = self.scan().filter(pl.col("AÑO") == str(anio))
+        if periodo is not None:
+            query = query.filter(pl.col("PERIODO") == str(periodo))
+        return query.collect()
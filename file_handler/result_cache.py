@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import polars as pl
+
+from file_handler.clean_file import DataFrameCleaner
+from utils.pattern_packs import packs_fingerprint
+
+_ROOT = Path(__file__).parents[1]
+
+# Archivos cuyo contenido determina el resultado de un PDF: toda la
+# extracción y las utilidades, más la limpieza y la escritura del Excel
+VERSIONED_FILES = (
+    *sorted((_ROOT / "extractor").glob("*.py")),
+    *sorted((_ROOT / "utils").glob("*.py")),
+    Path(__file__).parent / "clean_file.py",
+    Path(__file__).parent / "file_handler.py",
+    Path(__file__).parent / "analytics.py",
+)
+
+
+@lru_cache(maxsize=1)
+def rules_version() -> str:
+    """Hash del código de extracción, limpieza y exportación y de los patrones vigentes al iniciar el proceso."""
+    digest = hashlib.sha256()
+    for path in VERSIONED_FILES:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    digest.update(packs_fingerprint().encode())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Caché en disco de resultados por hash del PDF (`{version}/{clave}.*`):
+    el DataFrame limpio en Parquet, el Excel generado y un JSON con la
+    metadata del documento.
+
+    La versión de reglas forma parte de la ruta, así que cambiar la extracción,
+    `mapeo.py`, la limpieza, la exportación o los patrones invalida las entradas
+    anteriores, que se eliminan por antigüedad (LRU por fecha de último acceso)
+    al superar `max_bytes`.
+    """
+
+    _SUFFIXES = (".parquet", ".xlsx", ".json")
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(pdf_hash: str, options: Dict[str, Any], analytics: bool = False) -> str:
+        """Clave de un PDF procesado con las opciones de extracción dadas."""
+        options_hash = hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()[:12]
+        return f"{pdf_hash}-{options_hash}" + ("-analitica" if analytics else "")
+
+    def _entry(self, key: str) -> Path:
+        return self.root / rules_version() / key
+
+    def get(self, key: str) -> Optional[Tuple[pl.DataFrame, bytes, Dict[str, Any]]]:
+        """
+        Returns:
+            (DataFrame limpio, bytes del Excel, metadata) o None si no hay entrada vigente.
+        """
+        entry = self._entry(key)
+        paths = [entry.with_suffix(suffix) for suffix in self._SUFFIXES]
+        try:
+            # Parquet conserva los Enum; los Categorical vuelven con orden físico
+            df = DataFrameCleaner.tipos_categoricos(pl.read_parquet(paths[0]))
+            excel = paths[1].read_bytes()
+            meta = json.loads(paths[2].read_text(encoding="utf-8"))
+        except (OSError, ValueError, pl.exceptions.PolarsError):
+            return None
+
+        for path in paths:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return df, excel, meta
+
+    def put(self, key: str, df: pl.DataFrame, excel: bytes, meta: Dict[str, Any]) -> None:
+        """Guarda una entrada de forma atómica y aplica el límite de tamaño."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        # El JSON se escribe al final: su presencia indica una entrada completa
+        writers = (
+            (".parquet", lambda path: df.write_parquet(path)),
+            (".xlsx", lambda path: path.write_bytes(excel)),
+            (".json", lambda path: path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")),
+        )
+        for suffix, write in writers:
+            target = entry.with_suffix(suffix)
+            tmp_target = entry.with_suffix(suffix + f".{threading.get_ident()}.tmp")
+            write(tmp_target)
+            os.replace(tmp_target, target)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Elimina las entradas menos usadas hasta quedar bajo `max_bytes`."""
+        with self._lock:
+            entries: Dict[Path, Tuple[float, int]] = {}
+            for path in self.root.glob("*/*"):
+                if path.suffix not in self._SUFFIXES:
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                base = path.with_suffix("")
+                last_used, size = entries.get(base, (0.0, 0))
+                entries[base] = (max(last_used, stat.st_mtime), size + stat.st_size)
+
+            total = sum(size for _, size in entries.values())
+            for base, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+                if total <= self.max_bytes:
+                    break
+                for suffix in self._SUFFIXES:
+                    base.with_suffix(suffix).unlink(missing_ok=True)
+                total -= size
@@ -0,0 +1,379 @@
+import html
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, IO, List, Optional, Union
+
+import polars as pl
+
+WORKSHEET_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+WORKSHEET_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+WORKBOOK_PART = "xl/workbook.xml"
+WORKBOOK_RELS_PART = "xl/_rels/workbook.xml.rels"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+# Partes pequeñas que describen las hojas y se reescriben en cada operación
+MANIFEST_PARTS = (WORKBOOK_PART, WORKBOOK_RELS_PART, CONTENT_TYPES_PART)
+
+# Filas por lote al generar el XML de la hoja
+SHEET_BATCH_ROWS = 10_000
+# Bytes del inicio de una hoja existente donde se busca el estilo del encabezado
+HEADER_PROBE_BYTES = 64 * 1024
+MAX_SHEET_NAME = 31
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+# Caracteres de control que XML no admite (mismo criterio que openpyxl)
+ILLEGAL_XML_CHARS = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+# Versiones de CPython en las que se verificaron los atributos internos de
+# ZipFile que usa la escritura en sitio (`_truncate_central_directory`); en
+# otras el libro se reconstruye copiando las entradas
+ZIP_INTERNALS_VERSIONS = ((3, 8), (3, 13))
+_ZIP_INTERNALS = ("filelist", "NameToInfo", "start_dir")
+
+_ELEMENT = re.compile(r"<(?:\w+:)?(sheet|Relationship|Override)\b[^>]*?/>")
+_ATTRIBUTE = re.compile(r"([\w:]+)=\"([^\"]*)\"")
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _attributes(element: str) -> Dict[str, str]:
+    return {key: html.unescape(value) for key, value in _ATTRIBUTE.findall(element)}
+
+
+def _part_name(target: str) -> str:
+    """Ruta dentro del ZIP de un destino de `workbook.xml.rels`."""
+    return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+
+def _in_place_supported(archive: zipfile.ZipFile) -> bool:
+    low, high = ZIP_INTERNALS_VERSIONS
+    return (
+        platform.python_implementation() == "CPython"
+        and low <= sys.version_info[:2] <= high
+        and all(hasattr(archive, attribute) for attribute in _ZIP_INTERNALS)
+    )
+
+
+def _truncate_central_directory(archive: zipfile.ZipFile, dropped: set) -> int:
+    """
+    Quita `dropped` del directorio central de un ZIP abierto en modo "a". Las
+    entradas descartadas al final del archivo se sobrescriben con lo que se
+    escriba después; las intermedias solo dejan de estar referenciadas. Es el
+    único lugar que usa el estado interno de ZipFile.
+
+    Returns:
+        Posición desde la que se escribirá.
+    """
+    cutoff = archive.start_dir
+    for info in sorted(archive.filelist, key=lambda info: info.header_offset, reverse=True):
+        if info.filename not in dropped:
+            break
+        cutoff = info.header_offset
+
+    archive.filelist = [info for info in archive.filelist if info.filename not in dropped]
+    for part in dropped:
+        archive.NameToInfo.pop(part, None)
+    archive.start_dir = cutoff
+    return cutoff
+
+
+class IncrementalWorkbook:
+    """
+    Libro Excel consolidado al que se agregan o reemplazan hojas sin volver a
+    leer ni escribir las demás. Cada operación escribe la hoja nueva (con
+    cadenas en línea, sin tocar `sharedStrings.xml`) y reescribe solo
+    `workbook.xml`, sus relaciones y `[Content_Types].xml`, en modo append
+    sobre el ZIP: el costo depende del tamaño de la hoja, no del histórico.
+
+    Las partes reemplazadas quedan como bytes sin referencia dentro del
+    archivo; escribir el libro de nuevo con `FileHandler.export_to_excel`
+    recupera ese espacio. Fuera de `ZIP_INTERNALS_VERSIONS` el libro se
+    reconstruye copiando las demás entradas tal como están (solo se
+    descomprimen y vuelven a comprimir), sin volver a generar sus hojas.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+
+    def sheet_names(self) -> List[str]:
+        if not self.path.exists():
+            return []
+        with zipfile.ZipFile(self.path) as archive:
+            workbook = archive.read(WORKBOOK_PART).decode("utf-8")
+        return [sheet["name"] for sheet in self._sheets(workbook)]
+
+    def add_sheet(self, name: str, df: pl.DataFrame) -> Path:
+        """
+        Agrega una hoja al final del libro (lo crea si no existe).
+
+        Raises:
+            ValueError: si ya existe una hoja con ese nombre o el nombre no es válido.
+        """
+        return self._write(name, df, replace=False)
+
+    def replace_sheet(self, name: str, df: pl.DataFrame) -> Path:
+        """
+        Reemplaza el contenido de una hoja existente, conservando su posición.
+
+        Raises:
+            ValueError: si el libro o la hoja no existen.
+        """
+        return self._write(name, df, replace=True)
+
+    @staticmethod
+    def _sheets(workbook: str) -> List[Dict[str, str]]:
+        return [
+            _attributes(match.group(0))
+            for match in _ELEMENT.finditer(workbook) if match.group(1) == "sheet"
+        ]
+
+    @staticmethod
+    def _validate_name(name: str) -> None:
+        if not name or len(name) > MAX_SHEET_NAME or INVALID_SHEET_CHARS.search(name):
+            raise ValueError(f"Nombre de hoja no válido: {name!r}")
+
+    def _write(self, name: str, df: pl.DataFrame, replace: bool) -> Path:
+        self._validate_name(name)
+
+        if not self.path.exists():
+            if replace:
+                raise ValueError(f"No existe el libro {self.path}")
+            from file_handler.file_handler import FileHandler
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            FileHandler._write_sheets({name: df}, self.path)
+            return self.path
+
+        with zipfile.ZipFile(self.path) as archive:
+            manifests = {part: archive.read(part).decode("utf-8") for part in MANIFEST_PARTS}
+            header_style = self._header_style(archive, manifests)
+            entries = sorted(archive.infolist(), key=lambda info: info.header_offset)
+            in_place = _in_place_supported(archive)
+
+        workbook, rels, content_types = (manifests[part] for part in MANIFEST_PARTS)
+        sheets = self._sheets(workbook)
+        existing = {sheet["name"].lower(): sheet for sheet in sheets}
+        relationships = [
+            _attributes(match.group(0))
+            for match in _ELEMENT.finditer(rels) if match.group(1) == "Relationship"
+        ]
+
+        used_numbers = [
+            int(number) for info in entries
+            for number in re.findall(r"^xl/worksheets/sheet(\d+)\.xml$", info.filename)
+        ]
+        new_part = f"xl/worksheets/sheet{max(used_numbers, default=0) + 1}.xml"
+        dropped = set(MANIFEST_PARTS)
+
+        if replace:
+            sheet = existing.get(name.lower())
+            if sheet is None:
+                raise ValueError(f"El libro no tiene la hoja {name!r}")
+            rel_id = next(value for key, value in sheet.items() if key.endswith(":id"))
+            relationship = next(rel for rel in relationships if rel["Id"] == rel_id)
+            old_part = _part_name(relationship["Target"])
+            dropped |= {old_part, old_part.replace("worksheets/", "worksheets/_rels/") + ".rels"}
+
+            rels = self._replace_element(
+                rels, "Relationship", "Id", rel_id, "Target", f"/{new_part}"
+            )
+            try:
+                content_types = self._replace_element(
+                    content_types, "Override", "PartName", f"/{old_part}", "PartName", f"/{new_part}"
+                )
+            except ValueError:
+                content_types = self._insert_before(
+                    content_types, "</Types>",
+                    f'<Override PartName="/{new_part}" ContentType="{WORKSHEET_CONTENT_TYPE}"/>',
+                )
+        else:
+            if name.lower() in existing:
+                raise ValueError(f"El libro ya tiene la hoja {name!r}")
+            rel_ids = [int(rel["Id"][3:]) for rel in relationships if rel["Id"][3:].isdigit()]
+            rel_id = f"rId{max(rel_ids, default=0) + 1}"
+            sheet_id = max((int(sheet["sheetId"]) for sheet in sheets), default=0) + 1
+
+            workbook = self._insert_before(
+                workbook, "</sheets>",
+                f'<sheet xmlns:r="{RELATIONSHIPS_NS}" name="{html.escape(name)}" '
+                f'sheetId="{sheet_id}" state="visible" r:id="{rel_id}"/>',
+            )
+            rels = self._insert_before(
+                rels, "</Relationships>",
+                f'<Relationship Id="{rel_id}" Type="{WORKSHEET_REL_TYPE}" Target="/{new_part}"/>',
+            )
+            content_types = self._insert_before(
+                content_types, "</Types>",
+                f'<Override PartName="/{new_part}" ContentType="{WORKSHEET_CONTENT_TYPE}"/>',
+            )
+
+        parts = dict(zip(MANIFEST_PARTS, (workbook, rels, content_types)))
+        if in_place:
+            self._append_in_place(dropped, new_part, df, header_style, parts)
+        else:
+            self._rebuild(dropped, new_part, df, header_style, parts)
+        return self.path
+
+    def _append_in_place(
+        self,
+        dropped: set,
+        new_part: str,
+        df: pl.DataFrame,
+        header_style: Optional[str],
+        parts: Dict[str, str],
+    ) -> None:
+        cutoff, tail = None, b""
+        try:
+            with zipfile.ZipFile(self.path, "a") as archive:
+                cutoff = _truncate_central_directory(archive, dropped)
+                with open(self.path, "rb") as f:
+                    f.seek(cutoff)
+                    tail = f.read()
+                self._write_parts(archive, new_part, df, header_style, parts)
+        except BaseException:
+            # Solo se escribió desde `cutoff`: restaurar la cola deja el libro original
+            if cutoff is not None:
+                with open(self.path, "r+b") as f:
+                    f.seek(cutoff)
+                    f.write(tail)
+                    f.truncate()
+            raise
+
+    def _rebuild(
+        self,
+        dropped: set,
+        new_part: str,
+        df: pl.DataFrame,
+        header_style: Optional[str],
+        parts: Dict[str, str],
+    ) -> None:
+        fd, tmp_name = tempfile.mkstemp(suffix=".xlsx.tmp", dir=self.path.parent)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(self.path) as source, zipfile.ZipFile(tmp_name, "w") as archive:
+                for info in source.infolist():
+                    if info.filename in dropped:
+                        continue
+                    with source.open(info) as src, archive.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst)
+                self._write_parts(archive, new_part, df, header_style, parts)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _write_parts(
+        self,
+        archive: zipfile.ZipFile,
+        new_part: str,
+        df: pl.DataFrame,
+        header_style: Optional[str],
+        parts: Dict[str, str],
+    ) -> None:
+        info = zipfile.ZipInfo(new_part, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with archive.open(info, "w") as entry:
+            self._write_sheet_xml(entry, df, header_style)
+
+        for part, content in parts.items():
+            archive.writestr(part, content, compress_type=zipfile.ZIP_DEFLATED)
+
+    @staticmethod
+    def _insert_before(document: str, closing_tag: str, element: str) -> str:
+        position = document.rfind(closing_tag)
+        if position < 0:
+            raise ValueError(f"Libro no válido: falta {closing_tag}")
+        return document[:position] + element + document[position:]
+
+    @staticmethod
+    def _replace_element(
+        document: str, tag: str, key: str, value: str, attribute: str, new_value: str
+    ) -> str:
+        for match in _ELEMENT.finditer(document):
+            if match.group(1) == tag and _attributes(match.group(0)).get(key) == value:
+                element = re.sub(
+                    rf'\b{attribute}="[^"]*"', f'{attribute}="{html.escape(new_value)}"', match.group(0)
+                )
+                return document[:match.start()] + element + document[match.end():]
+        raise ValueError(f"Libro no válido: falta {tag} con {key}={value}")
+
+    @staticmethod
+    def _header_style(archive: zipfile.ZipFile, manifests: Dict[str, str]) -> Optional[str]:
+        """Estilo de la celda A1 de la primera hoja, para que el encabezado nuevo sea igual."""
+        rels = manifests[WORKBOOK_RELS_PART]
+        for match in _ELEMENT.finditer(rels):
+            relationship = _attributes(match.group(0))
+            if match.group(1) == "Relationship" and relationship.get("Type") == WORKSHEET_REL_TYPE:
+                with archive.open(_part_name(relationship["Target"])) as sheet:
+                    start = sheet.read(HEADER_PROBE_BYTES).decode("utf-8", errors="ignore")
+                if style := re.search(r'<c r="A1"[^>]*?\bs="(\d+)"', start):
+                    return style.group(1)
+                return None
+        return None
+
+    @staticmethod
+    def _cell(reference: str, value, style: Optional[str] = None) -> str:
+        style_attribute = f' s="{style}"' if style is not None else ""
+        if isinstance(value, bool):
+            return f'<c r="{reference}"{style_attribute} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)) and value == value:
+            return f'<c r="{reference}"{style_attribute} t="n"><v>{value}</v></c>'
+        # Nulos como texto vacío, igual que `to_excel` de pandas
+        text = "" if value is None or value != value else str(value)
+        if not text:
+            return f'<c r="{reference}"{style_attribute} t="inlineStr"/>'
+        text = html.escape(ILLEGAL_XML_CHARS.sub("", text), quote=False)
+        return (
+            f'<c r="{reference}"{style_attribute} t="inlineStr">'
+            f'<is><t xml:space="preserve">{text}</t></is></c>'
+        )
+
+    @staticmethod
+    def _write_sheet_xml(target: IO[bytes], df: pl.DataFrame, header_style: Optional[str]) -> None:
+        letters = [_column_letter(index) for index in range(1, df.width + 1)]
+        last_cell = f"{letters[-1]}{df.height + 1}" if letters else "A1"
+
+        target.write(
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetPr><outlinePr summaryBelow="1" summaryRight="1"/><pageSetUpPr/></sheetPr>'
+            f'<dimension ref="A1:{last_cell}"/>'
+            '<sheetViews><sheetView workbookViewId="0"><selection activeCell="A1" sqref="A1"/>'
+            '</sheetView></sheetViews><sheetFormatPr baseColWidth="8" defaultRowHeight="15"/>'
+            '<sheetData>'.encode("utf-8")
+        )
+
+        header = "".join(
+            IncrementalWorkbook._cell(f"{letter}1", column, header_style)
+            for letter, column in zip(letters, df.columns)
+        )
+        target.write(f'<row r="1">{header}</row>'.encode("utf-8"))
+
+        row_number = 1
+        for batch in df.iter_slices(SHEET_BATCH_ROWS):
+            rows: List[str] = []
+            for row in batch.iter_rows():
+                row_number += 1
+                cells = "".join(
+                    IncrementalWorkbook._cell(f"{letter}{row_number}", value)
+                    for letter, value in zip(letters, row)
+                )
+                rows.append(f'<row r="{row_number}">{cells}</row>')
+            target.write("".join(rows).encode("utf-8"))
+
+        target.write(
+            '</sheetData><pageMargins left="0.75" right="0.75" top="1" bottom="1" '
+            'header="0.5" footer="0.5"/></worksheet>'.encode("utf-8")
+        )
@@ -0,0 +1,23 @@
+"""
+Flujo completo de procesamiento y cola de trabajos. Las clases se importan
+a demanda.
+"""
+import importlib
+
+_EXPORTS = {
+    "run_document": ".processing",
+    "run_pipelined": ".pipeline",
+    "Job": ".job_queue",
+    "JobQueue": ".job_queue",
+    "ExtractionServer": ".http_service",
+    "stream_extraction": ".http_service",
+    "FolderWatcher": ".watcher",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,271 @@
+"""
+Servicio HTTP local de extracción (solo biblioteca estándar).
+
+    python -m services.http_service --port 8765 --workers 2 --queue 8
+
+    POST /extraer   cuerpo: el PDF (application/pdf)
+                    respuesta: NDJSON por partes, a medida que terminan las páginas:
+                      {"tipo": "registro", "pagina": n, ...registro}
+                      {"tipo": "error_pagina", "pagina": n, "error": ..., "segundos": ...}
+                      {"tipo": "resumen", "anio", "periodo", "registros", "paginas", ...}
+                      {"tipo": "error", "error": ...} si el documento falla
+    GET  /salud     {"estado": "ok", "procesando": n, "en_espera": n}
+
+Las solicitudes se atienden con un máximo de `workers` extracciones a la vez
+y `queue` en espera; las demás reciben 503. Cada PDF recibido se guarda en un
+archivo temporal y sus páginas se procesan en un proceso worker propio
+(`PageWorker`), así que las extracciones corren en paralelo en distintos
+núcleos y una página que excede `--page-timeout` se omite sin bloquear el
+worker.
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_UPLOAD_MB = 200
+DEFAULT_PAGE_TIMEOUT = 120.0
+# Bloque de lectura al copiar la carga al archivo temporal
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Errores de escritura cuando el cliente cerró la conexión
+DISCONNECT_ERRORS = (BrokenPipeError, ConnectionResetError)
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    """Servidor con un pool acotado de extracciones y una cola de espera acotada."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        max_workers: int = os.cpu_count() or 1,
+        max_pending: int = 8,
+        max_upload_bytes: int = DEFAULT_MAX_UPLOAD_MB * 1024 * 1024,
+        page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+    ) -> None:
+        super().__init__(address, ExtractionHandler)
+        self.max_pending = max_pending
+        self.max_upload_bytes = max_upload_bytes
+        self.page_timeout = page_timeout
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.pending = 0
+
+    def admit(self) -> bool:
+        """
+        Reserva un worker, esperando en la cola si todos están ocupados.
+        Retorna False si la cola de espera también está llena.
+        """
+        with self.lock:
+            if self.slots.acquire(blocking=False):
+                self.running += 1
+                return True
+            if self.pending >= self.max_pending:
+                return False
+            self.pending += 1
+
+        self.slots.acquire()
+        with self.lock:
+            self.pending -= 1
+            self.running += 1
+        return True
+
+    def release(self) -> None:
+        with self.lock:
+            self.running -= 1
+        self.slots.release()
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: ExtractionServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, content: Dict[str, Any]) -> None:
+        body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_line(self, content: Dict[str, Any]) -> None:
+        """Escribe una línea NDJSON como una parte de la respuesta."""
+        line = json.dumps(content, ensure_ascii=False).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        if self.path != "/salud":
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+        with self.server.lock:
+            status = {"estado": "ok", "procesando": self.server.running, "en_espera": self.server.pending}
+        self._send_json(200, status)
+
+    def do_POST(self) -> None:
+        if self.path != "/extraer":
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(400, {"error": "Se esperaba el PDF en el cuerpo de la solicitud"})
+            return
+        if length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self._send_json(413, {"error": "El PDF excede el tamaño máximo permitido"})
+            return
+
+        # La carga se guarda en disco: las solicitudes en espera no la retienen en memoria
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as upload:
+            shutil.copyfileobj(_LimitedReader(self.rfile, length), upload, UPLOAD_CHUNK_BYTES)
+        pdf_path = Path(upload.name)
+
+        try:
+            if not self.server.admit():
+                self._send_json(503, {"error": "El servicio está ocupado. Intenta nuevamente en unos minutos."})
+                return
+
+            try:
+                self._stream_extraction(pdf_path)
+            finally:
+                self.server.release()
+        finally:
+            pdf_path.unlink(missing_ok=True)
+
+    def _stream_extraction(self, pdf_path: Path) -> None:
+        from extractor.extractor import PDFExtractor
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        extractor = PDFExtractor(pdf_path)
+        sent = {"records": 0, "errors": 0, "pages": 0}
+
+        def send_page(current_page: int, total_pages: int, total_records: int) -> None:
+            for record in extractor.data[sent["records"]:]:
+                self._send_line({"tipo": "registro", "pagina": current_page, **record})
+            for error in extractor.page_errors[sent["errors"]:]:
+                self._send_line({"tipo": "error_pagina", **error})
+            sent["records"] = len(extractor.data)
+            sent["errors"] = len(extractor.page_errors)
+            sent["pages"] = total_pages
+
+        try:
+            page_errors = extractor.process_pdf(
+                progress_callback=send_page, page_timeout=self.server.page_timeout
+            )
+            self._send_line({
+                "tipo": "resumen",
+                "anio": extractor.year,
+                "periodo": extractor.period,
+                "registros": len(extractor.data),
+                "paginas": sent["pages"],
+                "paginas_con_error": len(page_errors),
+                "pdf_hash": extractor.get_pdf_hash(),
+            })
+        except Exception as e:
+            # Un corte durante las páginas llega envuelto por process_pdf
+            if isinstance(e, DISCONNECT_ERRORS) or isinstance(e.__cause__, DISCONNECT_ERRORS):
+                self.close_connection = True
+                return
+            try:
+                self._send_line({"tipo": "error", "error": str(e)})
+            except OSError:
+                self.close_connection = True
+                return
+        finally:
+            extractor.close()
+
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _LimitedReader:
+    """Lector de a lo sumo `remaining` bytes del cuerpo de la solicitud."""
+
+    def __init__(self, stream, remaining: int) -> None:
+        self.stream = stream
+        self.remaining = remaining
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.stream.read(size) if size else b""
+        self.remaining -= len(chunk)
+        return chunk
+
+
+def stream_extraction(
+    url: str, pdf: Union[bytes, str, Path], timeout: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Cliente local: envía un PDF al servicio y genera cada línea NDJSON de la
+    respuesta en cuanto llega.
+
+    Raises:
+        RuntimeError: si el servicio rechaza la solicitud.
+    """
+    if not isinstance(pdf, bytes):
+        pdf = Path(pdf).read_bytes()
+
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.request(
+            "POST", parts.path or "/extraer", body=pdf, headers={"Content-Type": "application/pdf"}
+        )
+        response = connection.getresponse()
+        if response.status != 200:
+            raise RuntimeError(f"{response.status}: {json.loads(response.read()).get('error')}")
+        for line in response:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de extracción")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue", type=int, default=8, help="Solicitudes en espera antes de responder 503")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB)
+    parser.add_argument(
+        "--page-timeout", type=float, default=DEFAULT_PAGE_TIMEOUT,
+        help="Segundos máximos por página antes de omitirla",
+    )
+    args = parser.parse_args()
+
+    server = ExtractionServer(
+        (args.host, args.port),
+        max_workers=args.workers,
+        max_pending=args.queue,
+        max_upload_bytes=args.max_upload_mb * 1024 * 1024,
+        page_timeout=args.page_timeout,
+    )
+    print(f"Escuchando en http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
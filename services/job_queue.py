@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Union
+
+from extractor.pdf_source import BufferReader
+from services.processing import run_document
+from utils.exceptions import JobRejectedError
+
+QUEUED = "en_cola"
+RUNNING = "procesando"
+DONE = "completado"
+FAILED = "error"
+
+
+class Job:
+    """Estado de un trabajo de extracción consultable desde cualquier sesión."""
+
+    def __init__(self, filename: str, total_pages: int) -> None:
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = QUEUED
+        self.current_page = 0
+        self.total_pages = total_pages
+        self.records = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error = ""
+        self.created = time.time()
+        self.finished: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def update_progress(self, current: int, total: int, records: int) -> None:
+        self.current_page = current
+        self.total_pages = total
+        self.records = records
+
+
+class JobQueue:
+    """
+    Cola de trabajos compartida por todo el servidor con un pool acotado de
+    workers. Rechaza trabajos cuando hay demasiados activos o el PDF excede
+    el máximo de páginas, y conserva los resultados hasta que se descargan.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = os.cpu_count() or 1,
+        max_jobs: int = 8,
+        max_pages: int = 2000,
+        result_ttl: float = 24 * 3600,
+    ) -> None:
+        self.max_jobs = max_jobs
+        self.max_pages = max_pages
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="extractor-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        pdf_data: Union[bytes, memoryview],
+        filename: str = "",
+        extractor=None,
+        total_pages: Optional[int] = None,
+    ) -> Job:
+        """
+        Encola un PDF para procesarlo en segundo plano. Acepta una vista
+        (p. ej. `UploadedFile.getbuffer()`) para no copiar la carga.
+
+        Args:
+            extractor: Extractor ya validado con `probe()`, cuyo documento abierto
+                       se reutiliza al procesar.
+            total_pages: Páginas del PDF si ya se conocen (p. ej. por `probe()`).
+
+        Raises:
+            JobRejectedError: si la cola está llena o el PDF tiene demasiadas páginas.
+        """
+        if total_pages is None:
+            import pdfplumber
+
+            with pdfplumber.open(BufferReader(pdf_data)) as pdf:
+                total_pages = len(pdf.pages)
+
+        if total_pages > self.max_pages:
+            raise JobRejectedError(
+                f"El PDF tiene {total_pages} páginas; el máximo permitido es {self.max_pages}"
+            )
+
+        with self._lock:
+            self._purge_expired()
+            active = sum(1 for job in self._jobs.values() if not job.is_finished)
+            if active >= self.max_jobs:
+                raise JobRejectedError(
+                    "El servidor está procesando demasiados archivos. Intenta nuevamente en unos minutos."
+                )
+
+            job = Job(filename, total_pages)
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, pdf_data, extractor)
+        return job
+
+    def _run(self, job: Job, pdf_data: Union[bytes, memoryview], extractor=None) -> None:
+        job.status = RUNNING
+        try:
+            job.result = run_document(
+                pdf_data, progress_callback=job.update_progress, extractor=extractor
+            )
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Consulta el estado de un trabajo."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def release(self, job_id: str) -> None:
+        """Libera un trabajo terminado una vez descargado su resultado."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.is_finished:
+                del self._jobs[job_id]
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and now - job.finished > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,179 @@
+"""
+Extracción, limpieza y escritura del Excel solapadas por lotes de páginas:
+
+    extracción ──lotes de registros──▶ limpieza ──lotes limpios──▶ escritura
+
+Las etapas se comunican por colas acotadas, así que la extracción se detiene
+si la limpieza se atrasa y la memoria en tránsito no crece con el documento.
+La limpieza del lote N corre mientras se extrae el lote N+1, y el Excel se
+escribe en modo streaming a medida que llegan los lotes limpios.
+
+El resultado es el mismo que el de la ruta en serie. Las decisiones que
+dependen del documento completo se toman al final: los tipos categóricos se
+aplican sobre el DataFrame concatenado y, si alguna columna opcional quedó
+vacía en todo el documento, se descarta lo adelantado y se limpia en serie.
+"""
+import io
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+import polars as pl
+
+from file_handler.clean_file import DataFrameCleaner
+from file_handler.file_handler import BASE_COLUMNS, OPTIONAL_COLUMNS, FileHandler
+
+# Páginas por lote enviado a la limpieza
+DEFAULT_BATCH_PAGES = 8
+# Lotes en espera entre dos etapas
+DEFAULT_QUEUE_SIZE = 2
+
+_END = object()
+
+
+class _Stage(threading.Thread):
+    """
+    Hilo que consume una cola hasta `_END`. Si un lote falla guarda el error
+    y sigue vaciando la cola para no bloquear a la etapa anterior.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: queue.Queue,
+        handle: Callable[[Any], None],
+        finish: Optional[Callable[[], None]] = None,
+        downstream: Optional[queue.Queue] = None,
+    ) -> None:
+        super().__init__(name=name, daemon=True)
+        self.source = source
+        self.handle = handle
+        self.finish = finish
+        self.downstream = downstream
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            while (item := self.source.get()) is not _END:
+                if self.error is None:
+                    try:
+                        self.handle(item)
+                    except Exception as e:
+                        self.error = e
+            if self.error is None and self.finish:
+                try:
+                    self.finish()
+                except Exception as e:
+                    self.error = e
+        finally:
+            if self.downstream is not None:
+                self.downstream.put(_END)
+
+
+def run_pipelined(
+    extractor,
+    analytics: bool = False,
+    progress_callback: Optional[Callable[[int, int, int], None]] = None,
+    batch_pages: int = DEFAULT_BATCH_PAGES,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    **process_options,
+) -> Tuple[pl.DataFrame, io.BytesIO]:
+    """
+    Procesa el PDF de `extractor` limpiando y escribiendo por lotes mientras
+    se extraen las páginas siguientes.
+
+    Args:
+        extractor: `PDFExtractor` con los registros en memoria (sin
+                   `memory_budget_mb`).
+        analytics: Excel con puestos y hoja RESUMEN. Los puestos dependen del
+                   documento completo, así que el Excel se escribe al final.
+        batch_pages: Páginas por lote.
+        queue_size: Lotes en espera entre etapas.
+        **process_options: Se pasan a `process_pdf` (checkpoint_dir, page_timeout, page_range).
+
+    Returns:
+        (DataFrame limpio, Excel en memoria), iguales a los de la ruta en serie.
+        El reporte de páginas con error queda en `extractor.page_errors`.
+    """
+    if not isinstance(extractor.data, list):
+        raise ValueError("La ejecución por etapas requiere los registros en memoria")
+
+    raw_batches: queue.Queue = queue.Queue(queue_size)
+    clean_batches: queue.Queue = queue.Queue(queue_size)
+    cleaned: List[pl.DataFrame] = []
+    with_data = dict.fromkeys(OPTIONAL_COLUMNS, False)
+
+    def clean(records):
+        df = FileHandler.prepare_dataframe(records)
+        for col in OPTIONAL_COLUMNS:
+            with_data[col] = with_data[col] or bool((df[col] != "").any())
+        # Sin tipos categóricos: se aplican sobre el documento completo
+        lf = pl.from_pandas(df[BASE_COLUMNS + OPTIONAL_COLUMNS]).lazy()
+        batch = DataFrameCleaner.clean_dataframe(lf).collect()
+        cleaned.append(batch)
+        clean_batches.put(batch)
+
+    output = io.BytesIO()
+    workbook = None
+    sheet = None
+    if not analytics:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+
+    def write(batch):
+        nonlocal sheet
+        if workbook is None:
+            return
+        if sheet is None:
+            sheet = workbook.create_sheet("Sheet1")
+            FileHandler.append_streaming_header(sheet, batch.columns)
+        for row in batch.iter_rows():
+            sheet.append(row)
+
+    def save():
+        if workbook is not None and sheet is not None:
+            workbook.save(output)
+
+    cleaner = _Stage("extractor-clean", raw_batches, clean, downstream=clean_batches)
+    writer = _Stage("extractor-write", clean_batches, write, finish=save)
+    cleaner.start()
+    writer.start()
+
+    sent = 0
+
+    def send_batch():
+        nonlocal sent
+        if len(extractor.data) > sent:
+            raw_batches.put(extractor.data[sent:])
+            sent = len(extractor.data)
+
+    def on_page(current_page: int, total_pages: int, total_records: int) -> None:
+        if current_page % batch_pages == 0 or current_page == total_pages:
+            send_batch()
+        if progress_callback:
+            progress_callback(current_page, total_pages, total_records)
+
+    try:
+        extractor.process_pdf(progress_callback=on_page, **process_options)
+        send_batch()
+    finally:
+        raw_batches.put(_END)
+        cleaner.join()
+        writer.join()
+
+    for stage in (cleaner, writer):
+        if stage.error is not None:
+            raise stage.error
+
+    if not cleaned or not all(with_data.values()):
+        # Columnas opcionales vacías en todo el documento: limpieza en serie
+        df_clean = FileHandler.build_clean_dataframe(extractor.data)
+        return df_clean, FileHandler.write_excel(df_clean, analytics=analytics)
+
+    df_clean = DataFrameCleaner.tipos_categoricos(pl.concat(cleaned))
+    if analytics:
+        return df_clean, FileHandler.write_excel(df_clean, analytics=True)
+
+    output.seek(0)
+    return df_clean, output
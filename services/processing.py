@@ -0,0 +1,126 @@
+import io
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+def create_extractor(pdf_source: Union[bytes, memoryview, io.BytesIO, str, Path]):
+    """`PDFExtractor` con las opciones configuradas por entorno."""
+    from extractor.extractor import PDFExtractor
+
+    memory_budget = os.environ.get("EXTRACTOR_MEMORY_BUDGET_MB")
+    memory_budget_mb = float(memory_budget) if memory_budget else None
+    return PDFExtractor(pdf_source, memory_budget_mb=memory_budget_mb)
+
+
+def run_document(
+    pdf_source: Union[bytes, memoryview, io.BytesIO, str, Path],
+    progress_callback: Optional[Callable[[int, int, int], None]] = None,
+    extractor=None,
+) -> Dict[str, Any]:
+    """
+    Ejecuta el flujo completo de un PDF: extracción, Excel y, si están
+    configurados por entorno, la caché de resultados, el dataset histórico
+    y el índice de DNI.
+
+    Args:
+        extractor: Extractor ya creado con `create_extractor` sobre el mismo
+                   PDF (p. ej. tras `probe()`), para reutilizar el documento abierto.
+
+    Returns:
+        Resumen con el Excel en memoria, el DataFrame limpio, nombre de
+        archivo, año, periodo, cantidad de registros, reporte de páginas con
+        error, DNIs repetidos y si el resultado vino de la caché.
+    """
+    # Importaciones diferidas: cada etapa carga sus dependencias al usarse
+    from extractor.spill import SpilledRecords
+    from file_handler.dni_index import DNIIndex
+    from file_handler.file_handler import FileHandler
+    from file_handler.historical_store import HistoricalStore
+
+    if extractor is None:
+        extractor = create_extractor(pdf_source)
+    spilled = isinstance(extractor.data, SpilledRecords)
+    pdf_hash = extractor.get_pdf_hash()
+    analytics = os.environ.get("EXTRACTOR_ANALYTICS", "") in ("1", "true", "yes")
+    pipelined = os.environ.get("EXTRACTOR_PIPELINE", "") in ("1", "true", "yes")
+
+    cache = _result_cache()
+    cached = None
+    if cache is not None:
+        cache_key = cache.make_key(pdf_hash, extractor.get_options(), analytics)
+        cached = cache.get(cache_key)
+
+    if cached is not None:
+        df_clean, excel_bytes, meta = cached
+        excel_buffer = io.BytesIO(excel_bytes)
+        extractor.close()
+    else:
+        process_options = {
+            "checkpoint_dir": os.environ.get("EXTRACTOR_CHECKPOINT_DIR"),
+            "page_timeout": float(os.environ.get("EXTRACTOR_PAGE_TIMEOUT", "120")),
+        }
+        excel_buffer = None
+
+        if pipelined and not spilled:
+            from services.pipeline import run_pipelined
+
+            df_clean, excel_buffer = run_pipelined(
+                extractor, analytics, progress_callback, **process_options
+            )
+            page_errors = extractor.page_errors
+        else:
+            page_errors = extractor.process_pdf(progress_callback=progress_callback, **process_options)
+            df_clean = FileHandler.build_clean_dataframe(extractor.data)
+
+        meta = {
+            "filename": extractor.get_filename(),
+            "year": extractor.year,
+            "period": extractor.period,
+            "records": len(extractor.data),
+            "page_errors": page_errors,
+        }
+        if spilled:
+            # Los fragmentos en disco ya no se necesitan una vez limpios
+            extractor.data.close()
+
+        if excel_buffer is None:
+            excel_buffer = FileHandler.write_excel(
+                df_clean, analytics=analytics, low_memory=spilled
+            )
+
+        # Un resultado con páginas omitidas puede deberse a un fallo transitorio
+        if cache is not None and not page_errors:
+            cache.put(cache_key, df_clean, excel_buffer.getvalue(), meta)
+
+    dni_index_path = os.environ.get("EXTRACTOR_DNI_INDEX")
+    store_path = os.environ.get("EXTRACTOR_HISTORICAL_STORE")
+    duplicates: Dict[str, int] = {}
+
+    if store_path:
+        HistoricalStore(store_path).upsert(df_clean, pdf_hash)
+
+    if dni_index_path:
+        duplicates = DNIIndex(dni_index_path).add_document(df_clean, pdf_hash)
+
+    return {
+        "excel": excel_buffer,
+        "clean": df_clean,
+        **meta,
+        "duplicates": duplicates,
+        "pdf_hash": pdf_hash,
+        "cached": cached is not None,
+    }
+
+
+@lru_cache(maxsize=1)
+def _result_cache():
+    """Caché de resultados compartida por los trabajos, si está configurada."""
+    from file_handler.result_cache import ResultCache
+
+    root = os.environ.get("EXTRACTOR_RESULT_CACHE")
+    if not root:
+        return None
+    max_mb = int(os.environ.get("EXTRACTOR_RESULT_CACHE_MB", "512"))
+    return ResultCache(root, max_bytes=max_mb * 1024 * 1024)
@@ -0,0 +1,205 @@
+"""
+Ingesta automática de una carpeta de PDFs.
+
+    python -m services.watcher entrada/ salida/ [--workers 4] [--interval 5] [--once]
+
+Revisa la carpeta de entrada cada `interval` segundos, descarta los PDFs cuyo
+contenido (SHA-256) ya se procesó o está en proceso, y procesa los nuevos con
+`run_document` en un pool acotado de procesos. Cada Excel se escribe en la
+carpeta de salida (el dataset histórico, el índice de DNI y la caché se
+configuran con las mismas variables de entorno que la app) y cada archivo
+queda registrado en `salida/manifiesto.jsonl` con su estado y tiempos.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from services.job_queue import DONE, FAILED
+
+MANIFEST_NAME = "manifiesto.jsonl"
+DUPLICATE = "duplicado"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 del archivo leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def process_file(pdf_path: str, output_dir: str) -> Dict[str, Any]:
+    """Procesa un PDF en un proceso del pool y escribe su Excel en `output_dir`."""
+    from services.processing import run_document
+
+    started = time.perf_counter()
+    try:
+        result = run_document(pdf_path)
+        output = Path(output_dir) / f"{Path(pdf_path).stem}.xlsx"
+        tmp_output = output.with_suffix(".xlsx.tmp")
+        tmp_output.write_bytes(result["excel"].getvalue())
+        os.replace(tmp_output, output)
+        return {
+            "estado": DONE,
+            "salida": str(output),
+            "anio": result["year"],
+            "periodo": result["period"],
+            "registros": result["records"],
+            "paginas_con_error": len(result["page_errors"]),
+            "segundos": round(time.perf_counter() - started, 3),
+        }
+    except Exception as e:
+        return {
+            "estado": FAILED,
+            "error": f"{type(e).__name__}: {e}",
+            "segundos": round(time.perf_counter() - started, 3),
+        }
+
+
+class FolderWatcher:
+    """
+    Vigila una carpeta por sondeo (sin dependencias de inotify) y procesa
+    cada PDF nuevo una sola vez por contenido.
+    """
+
+    def __init__(
+        self,
+        input_dir: Union[str, Path],
+        output_dir: Union[str, Path],
+        max_workers: int = os.cpu_count() or 1,
+        interval: float = 5.0,
+    ) -> None:
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.max_workers = max_workers
+        self.interval = interval
+
+        # Hash de cada PDF ya procesado y el archivo del que provino
+        self._processed: Dict[str, str] = self._load_processed()
+        self._in_flight: Dict[Future, Tuple[Path, str, float]] = {}
+        # Tamaño y fecha de modificación de cada archivo ya revisado
+        self._seen: Dict[Path, Tuple[int, float]] = {}
+        # Archivos aún en escritura: se revisan de nuevo en el siguiente sondeo
+        self._growing: Dict[Path, Tuple[int, float]] = {}
+
+    def _load_processed(self) -> Dict[str, str]:
+        processed: Dict[str, str] = {}
+        if not self.manifest_path.exists():
+            return processed
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("estado") == DONE:
+                    processed[entry["pdf_hash"]] = entry["archivo"]
+        return processed
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        entry = {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), **entry}
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _new_files(self):
+        """PDFs nuevos o modificados cuyo tamaño no cambió desde el sondeo anterior."""
+        for path in sorted(self.input_dir.glob("*.pdf")):
+            signature = self._signature(path)
+            if signature is None or self._seen.get(path) == signature:
+                continue
+            if self._growing.get(path) != signature:
+                self._growing[path] = signature
+                continue
+            del self._growing[path]
+            self._seen[path] = signature
+            yield path
+
+    def _submit_new(self, pool: ProcessPoolExecutor) -> None:
+        in_flight_hashes = {pdf_hash for _, pdf_hash, _ in self._in_flight.values()}
+        for path in self._new_files():
+            # Contrapresión: el resto se toma en un sondeo posterior
+            if len(self._in_flight) >= self.max_workers * 2:
+                del self._seen[path]
+                break
+            pdf_hash = file_hash(path)
+            if self._processed.get(pdf_hash) == str(path):
+                continue
+            if pdf_hash in self._processed or pdf_hash in in_flight_hashes:
+                self._record({"archivo": str(path), "pdf_hash": pdf_hash, "estado": DUPLICATE})
+                continue
+            future = pool.submit(process_file, str(path), str(self.output_dir))
+            self._in_flight[future] = (path, pdf_hash, time.time())
+            in_flight_hashes.add(pdf_hash)
+
+    def _collect(self, timeout: float) -> None:
+        if not self._in_flight:
+            time.sleep(timeout)
+            return
+        done, _ = wait(self._in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            path, pdf_hash, submitted = self._in_flight.pop(future)
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {"estado": FAILED, "error": f"{type(e).__name__}: {e}"}
+            if summary["estado"] == DONE:
+                self._processed[pdf_hash] = str(path)
+            self._record({
+                "archivo": str(path),
+                "pdf_hash": pdf_hash,
+                **summary,
+                "espera_s": round(time.time() - submitted - summary.get("segundos", 0), 3),
+            })
+
+    def run(self, once: bool = False) -> None:
+        """
+        Procesa la carpeta indefinidamente. Con `once`, termina cuando ya no
+        quedan archivos pendientes.
+        """
+        with ProcessPoolExecutor(self.max_workers, mp_context=mp.get_context("spawn")) as pool:
+            while True:
+                self._submit_new(pool)
+                self._collect(self.interval)
+                if once and not self._in_flight and not self._growing and not any(
+                    self._seen.get(path) != self._signature(path)
+                    for path in self.input_dir.glob("*.pdf")
+                ):
+                    break
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, float]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingesta automática de una carpeta de PDFs")
+    parser.add_argument("input_dir", type=Path)
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--interval", type=float, default=5.0, help="Segundos entre sondeos")
+    parser.add_argument("--once", action="store_true", help="Procesar lo pendiente y terminar")
+    args = parser.parse_args()
+
+    watcher = FolderWatcher(args.input_dir, args.output_dir, args.workers, args.interval)
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+PDFs sintéticos para las pruebas, escritos a mano sin dependencias: cada
+página es una lista de textos (x, y, texto) en Helvetica de 9 pt, con `y`
+medido desde el borde superior.
+"""
+from typing import List, Sequence, Tuple
+
+A4 = (595, 842)
+FONT_SIZE = 9
+
+Text = Tuple[float, float, str]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: Sequence[Sequence[Text]], size: Tuple[int, int] = A4) -> bytes:
+    width, height = size
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # /Pages, se completa al final
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+
+    for texts in pages:
+        content = "\n".join(
+            f"BT /F1 {FONT_SIZE} Tf {x} {height - y} Td ({_escape(text)}) Tj ET"
+            for x, y, text in texts
+        ).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (width, height, len(objects))
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def header(career: str = "MEDICINA HUMANA", top: float = 40) -> List[Text]:
+    """Encabezado de página con universidad, examen, modalidad y carrera."""
+    return [
+        (150, top, "UNIVERSIDAD NACIONAL SAN LUIS GONZAGA"),
+        (150, top + 15, "EXAMEN DE ADMISION 2024 - I"),
+        (40, top + 40, "MODALIDAD: ORDINARIA"),
+        (40, top + 55, f"CARRERA PROFESIONAL: {career}"),
+    ]
+
+
+def table_header(top: float, score_first: bool = False) -> List[Text]:
+    """Encabezado de tabla; por omisión con la condición antes del puntaje."""
+    last = ("PUNTAJE", "CONDICION") if score_first else ("CONDICION", "PUNTAJE")
+    return [
+        (40, top, "N"), (70, top, "DNI"), (140, top, "APELLIDOS Y NOMBRES"),
+        (400, top, last[0]), (480, top, last[1]),
+    ]
+
+
+def rows(first: int, count: int, top: float, step: float = 15) -> List[Text]:
+    """
+    Filas de datos en el orden de `table_header`. La condición antes del
+    puntaje no coincide con los patrones por línea: solo las lee el parser
+    por coordenadas.
+    """
+    texts: List[Text] = []
+    for index in range(count):
+        number = first + index
+        y = top + index * step
+        texts += [
+            (40, y, str(number)),
+            (70, y, str(40000000 + number)),
+            (140, y, f"APELLIDO{number} PEREZ, NOMBRE"),
+            (400, y, "INGRESO" if number % 3 else "NO INGRESO"),
+            (480, y, f"{10 + number % 10}.500"),
+        ]
+    return texts
+
+
+def line_rows(first: int, count: int, top: float, step: float = 15) -> List[Text]:
+    """Filas que reconocen tanto los patrones por línea como el parser por coordenadas."""
+    texts: List[Text] = []
+    for index in range(count):
+        number = first + index
+        y = top + index * step
+        texts += [
+            (40, y, str(number)),
+            (70, y, str(40000000 + number)),
+            (140, y, f"APELLIDO{number} PEREZ, NOMBRE"),
+            (400, y, f"{10 + number % 10}.500"),
+            (480, y, "INGRESO" if number % 3 else "NO INGRESO"),
+        ]
+    return texts
+
+
+def words_document(pages: int = 3, rows_per_page: int = 10) -> bytes:
+    """Tabla cuyo encabezado de columnas solo aparece en la primera página."""
+    content = []
+    for page in range(pages):
+        texts = header()
+        top = 125
+        if page == 0:
+            texts += table_header(top)
+        texts += rows(page * rows_per_page + 1, rows_per_page, top + 15)
+        content.append(texts)
+    return build_pdf(content)
+
+
+def lines_document(pages: int = 2, rows_per_page: int = 10) -> bytes:
+    """Documento que reconocen los patrones por línea."""
+    return build_pdf([
+        header() + line_rows(page * rows_per_page + 1, rows_per_page, 140)
+        for page in range(pages)
+    ])
+
+
+def table_document(pages: int = 2, rows_per_page: int = 10) -> bytes:
+    """Tabla que leen igual los patrones por línea y el parser por coordenadas."""
+    return build_pdf([
+        header() + table_header(125, score_first=True)
+        + line_rows(page * rows_per_page + 1, rows_per_page, 140)
+        for page in range(pages)
+    ])
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from extractor.extractor import PDFExtractor
+from utils.exceptions import PDFProcessingError
+
+from pdf_factory import words_document
+
+
+def _interrupt_after(page_number):
+    def callback(current_page, total_pages, total_records):
+        if current_page == page_number:
+            raise RuntimeError("interrumpido")
+    return callback
+
+
+def _interrupted_run(pdf, checkpoint_dir):
+    with pytest.raises(PDFProcessingError):
+        PDFExtractor(pdf, parser="words").process_pdf(
+            progress_callback=_interrupt_after(1), checkpoint_dir=checkpoint_dir
+        )
+
+
+def test_words_parser_resumes_with_learned_columns(tmp_path):
+    pdf = words_document(pages=3)
+    uninterrupted = PDFExtractor(pdf, parser="words")
+    uninterrupted.process_pdf()
+
+    _interrupted_run(pdf, tmp_path)
+    resumed = PDFExtractor(pdf, parser="words")
+    resumed.process_pdf(checkpoint_dir=tmp_path)
+
+    assert len(uninterrupted.data) == 30
+    assert resumed.data == uninterrupted.data
+
+
+def test_resume_without_saved_columns_learns_them(tmp_path):
+    pdf = words_document(pages=3)
+    _interrupted_run(pdf, tmp_path)
+
+    # Avance escrito por una versión que no guardaba las columnas
+    checkpoint = next(tmp_path.glob("*.jsonl"))
+    entries = [json.loads(line) for line in checkpoint.read_text(encoding="utf-8").splitlines()]
+    for entry in entries:
+        del entry["state"]["columns"]
+    checkpoint.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+
+    resumed = PDFExtractor(pdf, parser="words")
+    resumed.process_pdf(checkpoint_dir=tmp_path)
+    assert len(resumed.data) == 30
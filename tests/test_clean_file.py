@@ -0,0 +1,57 @@
+import openpyxl
+import polars as pl
+
+from file_handler.clean_file import DOMINIOS_CATEGORICOS, DataFrameCleaner
+from file_handler.file_handler import FileHandler
+from file_handler.historical_store import HistoricalStore
+
+
+def _record(modalidad: str, carrera: str) -> dict:
+    return {
+        "dni": "40000001",
+        "apellidos_nombres": "PEREZ, JUAN",
+        "puntaje": "15.500",
+        "condicion": "INGRESO",
+        "anio": "2024",
+        "periodo": "I",
+        "modalidad_ingreso": modalidad,
+        "carrera": carrera,
+        "orden_original": 1,
+    }
+
+
+def _clean(modalidad: str, carrera: str) -> pl.DataFrame:
+    return DataFrameCleaner.clean_dataframe(pl.DataFrame([_record(modalidad, carrera)]))
+
+
+def test_schema_does_not_depend_on_document_values():
+    known = _clean("ORDINARIA", "MEDICINA HUMANA")
+    unknown = _clean("CEPU", "INGENIERIA DE SOFTWARE")
+
+    assert known.schema == unknown.schema
+    for column, domain in DOMINIOS_CATEGORICOS.items():
+        expected = pl.Categorical if domain is None else pl.Enum
+        assert isinstance(known.schema[column], expected)
+    assert unknown["MODALIDAD"][0] == "CEPU"
+    assert unknown["CARRERA"][0] == "INGENIERIA DE SOFTWARE"
+
+
+def test_excel_keeps_unmapped_values(tmp_path):
+    output = FileHandler.export_to_excel([_record("CEPU", "INGENIERIA DE SOFTWARE")], tmp_path / "r.xlsx")
+
+    sheet = openpyxl.load_workbook(output, read_only=True).worksheets[0]
+    header, row = list(sheet.iter_rows(values_only=True))[:2]
+    values = dict(zip(header, row))
+    assert values["MODALIDAD"] == "CEPU"
+    assert values["CARRERA"] == "INGENIERIA DE SOFTWARE"
+
+
+def test_historical_store_keeps_categorical_columns(tmp_path):
+    store = HistoricalStore(tmp_path)
+    store.upsert(_clean("ORDINARIA", "MEDICINA HUMANA"), "a")
+    store.upsert(_clean("CEPU", "INGENIERIA DE SOFTWARE"), "b")
+
+    df = store.scan().collect()
+    assert sorted(df["MODALIDAD"].cast(pl.Utf8)) == ["CEPU", "ORDINARIA"]
+    assert df.schema["CONDICION"] == pl.Enum(DOMINIOS_CATEGORICOS["CONDICION"])
+    assert isinstance(df.schema["CARRERA"], pl.Categorical)
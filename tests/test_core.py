@@ -0,0 +1,32 @@
+from extractor import core
+from extractor.core import DocumentContext
+
+HEADER = "UNIVERSIDAD NACIONAL SAN LUIS GONZAGA\nEXAMEN DE ADMISION 2024-I"
+ROW = "1 12345678 PEREZ GOMEZ, JUAN 15.250 INGRESO"
+
+
+def _metadata(ctx: DocumentContext, text: str):
+    core.extract_metadata(ctx, text)
+    return ctx.year, ctx.period, ctx.modality, ctx.career
+
+
+def test_header_memo_reads_metadata_below_first_row():
+    page_a = f"{HEADER}\n{ROW}"
+    page_b = f"{HEADER}\n{ROW}\nMODALIDAD: CEPU\nCARRERA PROFESIONAL: MEDICINA HUMANA"
+
+    reference = DocumentContext(memoize_header=False)
+    memoized = DocumentContext(memoize_header=True)
+    for page in (page_a, page_b):
+        assert _metadata(memoized, page) == _metadata(reference, page)
+
+    assert memoized.modality == "CEPU"
+    assert memoized.career == "MEDICINA HUMANA"
+
+
+def test_header_memo_reuses_repeated_header():
+    page = f"{HEADER}\nMODALIDAD: ORDINARIA\nCARRERA PROFESIONAL: DERECHO\n{ROW}"
+    ctx = DocumentContext(memoize_header=True)
+    first = _metadata(ctx, page)
+
+    assert ctx.header_fingerprint is not None
+    assert _metadata(ctx, page) == first == _metadata(DocumentContext(), page)
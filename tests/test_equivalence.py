@@ -0,0 +1,90 @@
+import openpyxl
+import pytest
+
+from benchmarks.equivalence import PDF_PIPELINES, TEXT_PIPELINES, _extract_clean, compare, diff_frames
+from extractor.extractor import PDFExtractor
+from file_handler.file_handler import FileHandler
+from services.pipeline import run_pipelined
+
+from pdf_factory import table_document
+
+LINES = [
+    "UNIVERSIDAD NACIONAL SAN LUIS GONZAGA",
+    "1 40000001 APELLIDO1 PEREZ, NOMBRE 11.500 INGRESO",
+    "2 40000002 APELLIDO2 PEREZ, NOMBRE 12.500 NO INGRESO",
+    "3 40000003 APELLIDO3 PEREZ, NOMBRE AUSENTE",
+]
+
+
+@pytest.fixture
+def table_pdf(tmp_path):
+    path = tmp_path / "tabla.pdf"
+    path.write_bytes(table_document(pages=6))
+    return path
+
+
+@pytest.mark.parametrize("mode", ["cabecera", "palabras", "memoria", "rangos", "etapas"])
+def test_modes_match_reference(table_pdf, mode):
+    (result,) = compare(table_pdf, {mode: PDF_PIPELINES[mode]}, repeat=1)
+
+    assert result["diferencias"] == []
+    assert result["filas"] == 60
+    assert result["concordancia"] == 100.0
+
+
+def test_memory_budget_spill_matches_reference(table_pdf):
+    extractor = PDFExtractor(table_pdf, memory_budget_mb=0.005)
+    extractor.process_pdf()
+
+    assert extractor.data.chunks
+    spilled = FileHandler.build_clean_dataframe(extractor.data)
+    assert diff_frames(_extract_clean(str(table_pdf)), spilled) == []
+
+
+def _cells(excel):
+    workbook = openpyxl.load_workbook(excel)
+    return {sheet.title: list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets}
+
+
+@pytest.mark.parametrize("analytics", [False, True])
+def test_pipelined_excel_matches_serial(table_pdf, analytics):
+    serial = _extract_clean(str(table_pdf))
+    df_clean, excel = run_pipelined(PDFExtractor(table_pdf), analytics, batch_pages=2, queue_size=1)
+
+    assert diff_frames(serial, df_clean) == []
+    assert _cells(excel) == _cells(FileHandler.write_excel(serial, analytics=analytics))
+
+
+def test_pdf_differences_are_reported(table_pdf):
+    (result,) = compare(table_pdf, {"incompleta": lambda path: _extract_clean(path).slice(1)}, repeat=1)
+
+    assert not result["coincide"]
+    assert result["concordancia"] < 100.0
+    assert "filas: 60 != 59" in result["diferencias"]
+
+
+def test_text_lines_match_reference(tmp_path):
+    path = tmp_path / "pagina.txt"
+    path.write_text("\n".join(LINES), encoding="utf-8")
+    reference = TEXT_PIPELINES["referencia"]
+
+    def without_scores(lines):
+        return [record and {**record, "puntaje": ""} for record in reference(lines)]
+
+    same, changed = compare(path, {"identica": reference, "sin_puntaje": without_scores}, repeat=1)
+
+    assert same["coincide"] and same["filas"] == 3
+    assert not changed["coincide"]
+    # La fila AUSENTE ya no tiene puntaje: solo difieren las líneas 2 y 3
+    assert [difference.split(" ")[1] for difference in changed["diferencias"]] == ["2", "3"]
+
+
+def test_pipeline_is_opt_in_for_run_document(table_pdf, monkeypatch):
+    from services.processing import run_document
+
+    serial = run_document(str(table_pdf))
+    monkeypatch.setenv("EXTRACTOR_PIPELINE", "1")
+    pipelined = run_document(str(table_pdf))
+
+    assert diff_frames(serial["clean"], pipelined["clean"]) == []
+    assert _cells(pipelined["excel"]) == _cells(serial["excel"])
@@ -0,0 +1,69 @@
+import http.client
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from extractor.extractor import PDFExtractor
+from services.http_service import ExtractionHandler, ExtractionServer, stream_extraction
+
+from pdf_factory import lines_document
+
+
+def test_extraction_streams_records_from_worker_process():
+    pdf = lines_document(pages=2)
+    expected = PDFExtractor(pdf)
+    expected.process_pdf()
+
+    temp_before = set(Path(tempfile.gettempdir()).glob("*.pdf"))
+    server = ExtractionServer(("127.0.0.1", 0), max_workers=1, page_timeout=60)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/extraer"
+        lines = list(stream_extraction(url, pdf, timeout=120))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    records = [
+        {key: value for key, value in line.items() if key not in ("tipo", "pagina")}
+        for line in lines if line["tipo"] == "registro"
+    ]
+    assert records == expected.data
+    assert lines[-1]["tipo"] == "resumen"
+    assert lines[-1]["registros"] == 20
+    # La carga temporal se elimina al terminar
+    assert set(Path(tempfile.gettempdir()).glob("*.pdf")) == temp_before
+
+
+def test_client_disconnect_during_pages_is_not_answered(monkeypatch):
+    sent = []
+
+    def send_line(handler, content):
+        sent.append(content["tipo"])
+        if content["tipo"] == "registro":
+            raise BrokenPipeError("cliente desconectado")
+
+    monkeypatch.setattr(ExtractionHandler, "_send_line", send_line)
+    server = ExtractionServer(("127.0.0.1", 0), max_workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=120)
+        connection.request("POST", "/extraer", body=lines_document(pages=2))
+        try:
+            connection.getresponse().read()
+        except http.client.IncompleteRead:
+            pass
+        connection.close()
+
+        deadline = time.monotonic() + 60
+        while (not sent or server.running) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Tras el corte no se intenta escribir la línea de error
+    assert sent == ["registro"]
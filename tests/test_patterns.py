@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from extractor.extractor import PDFExtractor
+from utils.exceptions import PatternPackError
+from utils.pattern_packs import load_pack
+from utils.patterns import PatternManager
+
+from pdf_factory import lines_document
+
+
+def _pack(tmp_path, **extra):
+    path = tmp_path / "pack.json"
+    path.write_text(json.dumps({"extraction_patterns": [{
+        "name": "simple",
+        "priority": 10,
+        "regex": r"^(\d{8})\s+(.+?)\s+(INGRESO)$",
+        "groups": {"dni": 1, "name": 2, "condition": 3},
+        **extra,
+    }]}), encoding="utf-8")
+    return path
+
+
+def test_extraction_patterns_are_shared_immutably():
+    patterns = PatternManager.get_extraction_patterns()
+
+    assert isinstance(patterns, tuple)
+    assert patterns is PatternManager.get_extraction_patterns()
+    assert [name for name, _, _ in patterns][0] == "formato_completo"
+    assert PatternManager.get_extraction_patterns("unica") == patterns
+    assert PatternManager.get_extraction_patterns("otra") == ()
+
+
+def test_layout_is_optional_and_validated(tmp_path):
+    (_, _, layout, _, _), = load_pack(_pack(tmp_path))["extraction_patterns"]
+    assert layout == ""
+
+    (_, _, layout, _, _), = load_pack(_pack(tmp_path, layout="otra"))["extraction_patterns"]
+    assert layout == "otra"
+
+    with pytest.raises(PatternPackError):
+        load_pack(_pack(tmp_path, layout=3))
+
+
+def test_probe_reports_layout_of_detected_pattern():
+    info = PDFExtractor(lines_document(pages=1)).probe()
+
+    assert info["valido"]
+    assert info["layout"] == PatternManager.get_layout(info["patron"]) == "unica"
@@ -0,0 +1,62 @@
+import tracemalloc
+
+import pytest
+
+from extractor.extractor import PDFExtractor
+from utils.exceptions import PDFProcessingError
+
+from pdf_factory import lines_document
+
+
+def test_bytes_source_is_hashed_without_copy():
+    data = bytes(8 * 1024 * 1024)
+    extractor = PDFExtractor(data)
+
+    tracemalloc.start()
+    extractor.get_pdf_hash()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < 1024 * 1024
+
+
+def test_bytes_source_is_processed():
+    extractor = PDFExtractor(lines_document(pages=1))
+    extractor.process_pdf()
+
+    assert len(extractor.data) == 10
+
+
+def test_empty_file_is_a_processing_error(tmp_path):
+    empty = tmp_path / "vacio.pdf"
+    empty.touch()
+    with pytest.raises(PDFProcessingError):
+        PDFExtractor(empty)
+
+
+def test_mapping_is_released_after_processing_and_close(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(lines_document(pages=1))
+
+    extractor = PDFExtractor(pdf_path)
+    mapping = extractor.pdf_source
+    extractor.process_pdf()
+    assert mapping.closed
+    assert len(extractor.data) == 10
+
+    # El hash vuelve a mapear el archivo; close() lo libera otra vez
+    assert extractor.get_pdf_hash()
+    remapped = extractor.pdf_source
+    extractor.close()
+    assert remapped.closed
+
+
+def test_close_after_probe_releases_mapping(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(lines_document(pages=1))
+
+    extractor = PDFExtractor(pdf_path)
+    assert extractor.probe()["valido"]
+    mapping = extractor.pdf_source
+    extractor.close()
+    assert mapping.closed
@@ -0,0 +1,25 @@
+from file_handler import result_cache
+from file_handler.result_cache import ResultCache
+
+
+def test_version_covers_extraction_and_export_code():
+    names = {path.relative_to(result_cache._ROOT).as_posix() for path in result_cache.VERSIONED_FILES}
+    for module in (
+        "extractor/core.py",
+        "extractor/word_parser.py",
+        "extractor/metadata_parser.py",
+        "utils/text_cleaner.py",
+        "file_handler/file_handler.py",
+        "file_handler/analytics.py",
+    ):
+        assert module in names
+
+
+def test_key_depends_on_extraction_options():
+    text = ResultCache.make_key("abc", {"parser": "text", "memoize_header": False})
+    words = ResultCache.make_key("abc", {"parser": "words", "memoize_header": False})
+    reordered = ResultCache.make_key("abc", {"memoize_header": False, "parser": "text"})
+
+    assert text != words
+    assert text == reordered
+    assert ResultCache.make_key("abc", {}, analytics=True).endswith("-analitica")
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from extractor.extractor import PDFExtractor
+from extractor.sharding import merge_partials, plan_units, run_unit
+
+from pdf_factory import words_document
+
+
+@pytest.mark.parametrize("page_timeout", [None, 60])
+def test_words_ranges_match_full_run(tmp_path, page_timeout):
+    pdf_path = tmp_path / "tabla.pdf"
+    pdf_path.write_bytes(words_document(pages=3))
+    full = PDFExtractor(pdf_path, parser="words")
+    full.process_pdf()
+
+    units = tmp_path / "unidades"
+    for manifest in plan_units(pdf_path, units, pages_per_unit=1, options={"parser": "words"}):
+        run_unit(manifest, page_timeout=page_timeout)
+
+    assert len(full.data) == 30
+    assert merge_partials(units)["data"] == full.data
+
+
+def test_plan_records_columns_per_range(tmp_path):
+    pdf_path = tmp_path / "tabla.pdf"
+    pdf_path.write_bytes(words_document(pages=3))
+
+    manifests = plan_units(pdf_path, tmp_path / "unidades", pages_per_unit=1, options={"parser": "words"})
+    columns = [json.loads(path.read_text(encoding="utf-8"))["columnas"] for path in manifests]
+
+    assert columns[0] is None
+    assert columns[1] == columns[2] is not None
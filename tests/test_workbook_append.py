@@ -0,0 +1,55 @@
+import openpyxl
+import polars as pl
+import pytest
+
+from file_handler import workbook_append
+from file_handler.file_handler import FileHandler
+
+
+def _period(anio: str, periodo: str, rows: int = 3) -> pl.DataFrame:
+    return pl.DataFrame({
+        "DNI": [str(40000000 + index) for index in range(rows)],
+        "APELLIDOS Y NOMBRES": [f"APELLIDO{index}, NOMBRE" for index in range(rows)],
+        "AÑO": [anio] * rows,
+        "PERIODO": [periodo] * rows,
+    })
+
+
+def _contents(path):
+    workbook = openpyxl.load_workbook(path)
+    return {sheet.title: list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets}
+
+
+@pytest.fixture(params=["en_sitio", "reconstruido"])
+def mode(request, monkeypatch):
+    if request.param == "reconstruido":
+        monkeypatch.setattr(workbook_append, "ZIP_INTERNALS_VERSIONS", ((2, 0), (2, 0)))
+    return request.param
+
+
+def test_add_and_replace_periods(tmp_path, mode):
+    path = tmp_path / "consolidado.xlsx"
+    FileHandler.export_to_workbook(_period("2023", "I"), path, "2023", "I")
+    FileHandler.export_to_workbook(_period("2023", "II"), path, "2023", "II")
+    FileHandler.export_to_workbook(_period("2023", "I", rows=5), path, "2023", "I", replace=True)
+    FileHandler.export_to_workbook(_period("2024", "I"), path, "2024", "I")
+
+    contents = _contents(path)
+    assert list(contents) == ["2023-I", "2023-II", "2024-I"]
+    assert contents["2023-I"][0] == ("DNI", "APELLIDOS Y NOMBRES", "AÑO", "PERIODO")
+    assert len(contents["2023-I"]) == 6
+    assert contents["2023-II"][1] == ("40000000", "APELLIDO0, NOMBRE", "2023", "II")
+    assert contents["2024-I"][-1] == ("40000002", "APELLIDO2, NOMBRE", "2024", "I")
+
+
+def test_existing_sheet_name_is_rejected(tmp_path, mode):
+    path = tmp_path / "consolidado.xlsx"
+    FileHandler.export_to_workbook(_period("2023", "I"), path, "2023", "I")
+    FileHandler.export_to_workbook(_period("2023", "II"), path, "2023", "II")
+    before = path.read_bytes()
+
+    with pytest.raises(ValueError):
+        FileHandler.export_to_workbook(_period("2023", "I"), path, "2023", "I")
+    with pytest.raises(ValueError):
+        FileHandler.export_to_workbook(_period("2025", "I"), path, "2025", "I", replace=True)
+    assert path.read_bytes() == before
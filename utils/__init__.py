@@ -1,4 +1,28 @@
-from .patterns import *
-from .text_cleaner import *
-from .exceptions import *
-from .mapeo import *
+"""
+Utilidades compartidas. Los nombres se importan a demanda desde su módulo.
+"""
+import importlib
+
+_EXPORTS = {
+    "PatternManager": ".patterns",
+    "TextCleaner": ".text_cleaner",
+    "PDFExtractorError": ".exceptions",
+    "PDFProcessingError": ".exceptions",
+    "PatternMatchError": ".exceptions",
+    "MetadataExtractionError": ".exceptions",
+    "PageTimeoutError": ".exceptions",
+    "JobRejectedError": ".exceptions",
+    "PatternPackError": ".exceptions",
+    "mapping": ".mapeo",
+    "dict_carreras": ".mapeo",
+    "dict_facultades": ".mapeo",
+    "dict_area": ".mapeo",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,4 +15,19 @@ class PatternMatchError(PDFExtractorError):
 
 class MetadataExtractionError(PDFExtractorError):
     """Error durante la extracción de metadata"""
-    pass
\ No newline at end of file
+    pass
+
+
+class PageTimeoutError(PDFProcessingError):
+    """Una página excedió el tiempo máximo de procesamiento"""
+    pass
+
+
+class JobRejectedError(PDFExtractorError):
+    """El trabajo fue rechazado por el control de admisión de la cola"""
+    pass
+
+
+class PatternPackError(PDFExtractorError):
+    """Paquete de patrones inválido o que no compila"""
+    pass
@@ -0,0 +1,156 @@
+"""
+Paquetes declarativos de patrones (`utils/packs/*.json`).
+
+Cada paquete define patrones de filas (`extraction_patterns`) y de año/periodo
+(`year_period_patterns`) con nombre, regex, flags, prioridad, etiqueta de
+formato opcional (`layout`) y el número de grupo que corresponde a cada campo.
+Los paquetes se validan y compilan una sola vez por proceso; se pueden agregar otros archivos o carpetas con la
+variable de entorno EXTRACTOR_PATTERN_PACKS (rutas separadas por `os.pathsep`).
+"""
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Match, Pattern, Tuple
+
+from utils.exceptions import PatternPackError
+
+PACKS_DIR = Path(__file__).parent / "packs"
+PACKS_ENV = "EXTRACTOR_PATTERN_PACKS"
+
+# Campos que produce cada sección y los obligatorios en su mapeo de grupos
+SECTIONS = {
+    "extraction_patterns": (("dni", "name", "score", "condition"), {"dni", "name", "condition"}),
+    "year_period_patterns": (("year", "period"), {"year"}),
+}
+
+# (prioridad, nombre, layout, patrón compilado, extractor de campos)
+CompiledPattern = Tuple[int, str, str, Pattern, Callable[[Match], Tuple[str, ...]]]
+
+
+def pack_files() -> Tuple[Path, ...]:
+    """Archivos de paquetes activos: los incluidos y los de EXTRACTOR_PATTERN_PACKS."""
+    files = sorted(PACKS_DIR.glob("*.json"))
+    for entry in filter(None, os.environ.get(PACKS_ENV, "").split(os.pathsep)):
+        path = Path(entry)
+        files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return tuple(files)
+
+
+def packs_fingerprint() -> str:
+    """Hash del contenido de los paquetes activos, para versionar resultados."""
+    digest = hashlib.sha256()
+    for path in pack_files():
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _group_extractor(fields: Tuple[str, ...], groups: Dict[str, int]) -> Callable[[Match], Tuple[str, ...]]:
+    indexes = tuple(groups.get(field) for field in fields)
+
+    def extract(match: Match) -> Tuple[str, ...]:
+        return tuple((match.group(index) or "") if index else "" for index in indexes)
+
+    return extract
+
+
+def _compile_entry(entry: Dict[str, Any], section: str, source: str) -> CompiledPattern:
+    fields, required = SECTIONS[section]
+    name = entry.get("name")
+    where = f"{source}: {section}[{name!r}]"
+
+    if not isinstance(name, str) or not name:
+        raise PatternPackError(f"{source}: cada patrón de {section} necesita un 'name'")
+    if not isinstance(entry.get("regex"), str):
+        raise PatternPackError(f"{where}: falta 'regex'")
+    if not isinstance(entry.get("priority"), int):
+        raise PatternPackError(f"{where}: 'priority' debe ser un entero")
+    if not isinstance(entry.get("layout", ""), str):
+        raise PatternPackError(f"{where}: 'layout' debe ser texto")
+
+    flags = 0
+    for flag in entry.get("flags", []):
+        if not isinstance(getattr(re, str(flag), None), re.RegexFlag):
+            raise PatternPackError(f"{where}: flag desconocido {flag!r}")
+        flags |= getattr(re, flag)
+
+    try:
+        pattern = re.compile(entry["regex"], flags)
+    except re.error as e:
+        raise PatternPackError(f"{where}: regex inválida ({e})") from e
+
+    groups = entry.get("groups")
+    if not isinstance(groups, dict):
+        raise PatternPackError(f"{where}: falta el mapeo 'groups'")
+    if unknown := set(groups) - set(fields):
+        raise PatternPackError(f"{where}: campos desconocidos {sorted(unknown)}")
+    if missing := required - set(groups):
+        raise PatternPackError(f"{where}: faltan los campos {sorted(missing)}")
+    for field, index in groups.items():
+        if not isinstance(index, int) or not 1 <= index <= pattern.groups:
+            raise PatternPackError(
+                f"{where}: el grupo {index!r} de '{field}' no existe en la regex"
+            )
+
+    return (
+        entry["priority"],
+        name,
+        entry.get("layout", ""),
+        pattern,
+        _group_extractor(fields, groups),
+    )
+
+
+def load_pack(path: Path) -> Dict[str, List[CompiledPattern]]:
+    """
+    Lee, valida y compila un paquete.
+
+    Raises:
+        PatternPackError: si el archivo no es un paquete válido.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise PatternPackError(f"No se pudo leer el paquete {path}: {e}") from e
+
+    if not isinstance(data, dict):
+        raise PatternPackError(f"{path}: el paquete debe ser un objeto JSON")
+
+    compiled = {}
+    for section in SECTIONS:
+        entries = data.get(section, [])
+        if not isinstance(entries, list):
+            raise PatternPackError(f"{path}: '{section}' debe ser una lista")
+        compiled[section] = [_compile_entry(entry, section, path.name) for entry in entries]
+    return compiled
+
+
+@lru_cache(maxsize=None)
+def compiled_patterns(files: Tuple[Path, ...]) -> Dict[str, List[CompiledPattern]]:
+    """
+    Une y ordena por prioridad los patrones de los paquetes. A igual prioridad
+    se conserva el orden de los archivos y de cada lista.
+
+    Raises:
+        PatternPackError: si un paquete es inválido o repite un nombre de patrón.
+    """
+    merged: Dict[str, List[CompiledPattern]] = {section: [] for section in SECTIONS}
+    for path in files:
+        for section, patterns in load_pack(path).items():
+            merged[section].extend(patterns)
+
+    for section, patterns in merged.items():
+        names = [pattern[1] for pattern in patterns]
+        if duplicated := {name for name in names if names.count(name) > 1}:
+            raise PatternPackError(f"Patrones repetidos en {section}: {sorted(duplicated)}")
+        patterns.sort(key=lambda pattern: pattern[0])
+    return merged
+
+
+@lru_cache(maxsize=1)
+def active_patterns() -> Dict[str, List[CompiledPattern]]:
+    """Patrones compilados de los paquetes activos al iniciar el proceso."""
+    return compiled_patterns(pack_files())